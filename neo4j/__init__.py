@@ -1,15 +1,17 @@
 
 from neo4j.connection import Connection
+from neo4j.bolt import BoltConnection
 
 apilevel = '2.0'
-threadsafety = 1
+threadsafety = 2
 
 # This is non-standard, it uses neos built-in params. 
 paramstyle = 'curly'
 
 
 def connect(dsn, username=None, password=None):
-    con = Connection(dsn)
+    """ Connects over the http transactional endpoint, or over Bolt for bolt:// DSNs. """
+    con = BoltConnection(dsn) if dsn.startswith('bolt://') else Connection(dsn)
     if username and password:
         con.authorization(username, password)
     return con
@@ -21,30 +23,98 @@ def connect(dsn, username=None, password=None):
 # does not know in advance what types it will be dealing with.
 # Because of this, we always describe return types as neo4j.MIXED,
 # and we don't currently allow using the richer type set defined
-# by the spec, since the transport format is JSON. This will change
-# when the transport format changes.
+# by the spec, since the transport format is JSON. Bolt connections
+# do get native integers, floats and byte arrays, but the type codes
+# are kept the same for both transports.
 #
 
-class Node(dict):
+class _GraphElement(object):
+    """
+    Read-only, dict-like access to the properties of a node or relationship. The property dict decoded off the
+    wire is wrapped rather than copied, and instances have no __dict__, to keep large results small.
+    """
+    __slots__ = ('id', '_properties')
+
+    def __getitem__(self, key):
+        return self._properties[key]
+
+    def get(self, key, default=None):
+        return self._properties.get(key, default)
+
+    def keys(self):
+        return self._properties.keys()
+
+    def values(self):
+        return self._properties.values()
+
+    def items(self):
+        return self._properties.items()
+
+    def __contains__(self, key):
+        return key in self._properties
+
+    def __iter__(self):
+        return iter(self._properties)
+
+    def __len__(self):
+        return len(self._properties)
+
+    def __eq__(self, other):
+        if isinstance(other, _GraphElement):
+            other = other._properties
+        return self._properties == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%r, %r)' % (type(self).__name__, self.id, self._properties)
+
+
+class Node(_GraphElement):
+    __slots__ = ('labels',)
 
     def __init__(self, node_id, labels, properties):
         self.id = node_id
-        self.labels = labels
-        for k,v in properties.items():
-            self[k] = v
+        self.labels = [_intern(label) for label in labels]
+        self._properties = properties
 
+    def __reduce__(self):
+        return Node, (self.id, self.labels, self._properties)
 
-class Relationship(dict):
+
+class Relationship(_GraphElement):
+    __slots__ = ('type', 'start_id', 'end_id')
 
     def __init__(self, rel_id, rel_type, start_node_id, end_node_id, properties):
         self.id = rel_id
-        self.type = rel_type
+        self.type = _intern(rel_type)
         self.start_id = start_node_id
         self.end_id = end_node_id
-        
-        for k,v in properties.items():
-            self[k] = v
-    
+        self._properties = properties
+
+    def __reduce__(self):
+        return Relationship, (self.id, self.type, self.start_id, self.end_id, self._properties)
+
+
+# Labels and relationship types repeat across a result, keep one copy of each
+_interned = {}
+
+
+def _intern(name):
+    try:
+        return _interned[name]
+    except KeyError:
+        return _interned.setdefault(name, name)
+
+try:
+    from collections.abc import Mapping as _Mapping
+except ImportError:
+    from collections import Mapping as _Mapping
+_Mapping.register(_GraphElement)
+
 
 class TypeCode(object):
     
@@ -0,0 +1,264 @@
+"""
+An asyncio flavour of the driver, for use from within an event loop. Requires Python 3.5 or later.
+
+It talks to the same transactional endpoint as neo4j.connect, and raises the same exceptions and returns the same
+types. Statements are sent as soon as they are executed rather than queued, and each connection runs one
+transaction at a time on one socket; use several connections to keep many transactions in flight.
+
+    import neo4j.aio
+
+    async def main():
+        connection = await neo4j.aio.connect("http://localhost:7474", "neo4j", "secret")
+        cursor = connection.cursor()
+        await cursor.execute("MATCH (n:User) RETURN n.name, n.age")
+        async for name, age in cursor:
+            print(name, age)
+        await connection.rollback()
+        await connection.close()
+"""
+import asyncio
+import base64
+
+import neo4j
+from neo4j import jsoncodec
+from neo4j import connection as _connection
+from neo4j import cursor as _cursor
+from neo4j.connection import TX_ENDPOINT, default_error_handler, neo_code_to_error_class
+from neo4j.strings import ustr
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+
+async def connect(dsn, username=None, password=None):
+    con = Connection(dsn)
+    if username and password:
+        con.authorization(username, password)
+    await con._http.open()
+    return con
+
+
+class Connection(object):
+
+    Error = _connection.Connection.Error
+    Warning = _connection.Connection.Warning
+    InterfaceError = _connection.Connection.InterfaceError
+    DatabaseError = _connection.Connection.DatabaseError
+    InternalError = _connection.Connection.InternalError
+    OperationalError = _connection.Connection.OperationalError
+    ProgrammingError = _connection.Connection.ProgrammingError
+    IntegrityError = _connection.Connection.IntegrityError
+    DataError = _connection.Connection.DataError
+    NotSupportedError = _connection.Connection.NotSupportedError
+
+    def __init__(self, db_uri):
+        self.errorhandler = default_error_handler
+        uri = urlparse(db_uri)
+        self._http = _HTTPConnection(uri.hostname, uri.port or 80)
+        self._headers = dict(_connection.Connection._COMMON_HEADERS)
+        self.codec = jsoncodec.get()
+        self.observers = []  # Told about rows fetched, see neo4j.instrumentation
+        self._tx = TX_ENDPOINT
+        self._lock = asyncio.Lock()
+        self._messages = []
+        self._cursor_ids = 0
+
+    def authorization(self, username, password):
+        basic_auth = '%s:%s' % (username, password)
+        auth = base64.b64encode(basic_auth.encode('utf-8')).decode('ascii')
+        self._headers["Authorization"] = "Basic %s" % auth
+
+    async def commit(self):
+        self._messages = []
+        if self._tx != TX_ENDPOINT:
+            response = self._deserialize(await self._http_req("POST", self._tx + "/commit"))
+            self._tx = TX_ENDPOINT
+            self._handle_errors(response, self, None)
+
+    async def rollback(self):
+        self._messages = []
+        if self._tx != TX_ENDPOINT:
+            try:
+                response = self._deserialize(await self._http_req("DELETE", self._tx))
+                self._tx = TX_ENDPOINT
+                self._handle_errors(response, self, None)
+            except self.OperationalError:
+                # Transaction may have timed out and been rolled back.
+                pass
+
+    def cursor(self):
+        self._messages = []
+        self._cursor_ids += 1
+        return Cursor(self._cursor_ids, self)
+
+    async def close(self):
+        self._messages = []
+        await self._http.close()
+
+    @property
+    def messages(self):
+        return self._messages
+
+    def _forget_cursor(self, cursor):
+        pass
+
+    async def _execute(self, cursor, statements):
+        payload = [{'statement': s, 'parameters': p, 'resultDataContents': ['rest']} for (s, p) in statements]
+        body, headers = await self._http_req("POST", self._tx, {'statements': payload}, with_headers=True)
+
+        if self._tx == TX_ENDPOINT:
+            self._tx = headers.get('location', TX_ENDPOINT)
+
+        response = self._deserialize(body)
+        self._handle_errors(response, cursor, cursor)
+        return response['results'][-1]
+
+    async def _http_req(self, method, path, payload=None, with_headers=False):
+        serialized_payload = self.codec.dumps(payload) if payload is not None else None
+
+        async with self._lock:
+            try:
+                status, headers, body = await self._http.request(method, path, serialized_payload, self._headers)
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                await self._http.close()
+                self._handle_error(self, None, self.OperationalError, "Connection failed: " + ustr(e))
+
+        if status not in (200, 201):
+            message = "Server returned unexpected response: " + ustr(status) + ustr(body)
+            self._handle_error(self, None, self.OperationalError, message)
+
+        return (body, headers) if with_headers else body
+
+    def _handle_errors(self, response, owner, cursor):
+        for error in response['errors']:
+            error_class = neo_code_to_error_class(error['code'])
+            error_value = ustr(error['code']) + ": " + ustr(error['message'])
+            self._handle_error(owner, cursor, error_class, error_value)
+
+    def _handle_error(self, owner, cursor, error_class, error_value):
+        if error_class.rollback:
+            self._tx = TX_ENDPOINT
+        owner._messages.append((error_class, error_value))
+        owner.errorhandler(self, cursor, error_class, error_value)
+
+    def _deserialize(self, body):
+        return self.codec.loads(body)
+
+
+class Cursor(_cursor.Cursor):
+
+    """
+    Executes statements immediately, `await cursor.execute(...)`, after which rows can be read with the
+    fetch coroutines or with `async for`.
+    """
+
+    def __init__(self, cursorid, connection):
+        super(Cursor, self).__init__(cursorid, connection, None)
+
+    async def execute(self, statement, *args, **kwargs):
+        _cursor.Cursor.execute(self, statement, *args, **kwargs)
+        pending = self._pending
+        self._pending = []
+        self._rows = []
+        self._description = []
+
+        result = await self.connection._execute(self, pending)
+
+        self._rows = result['data']
+        self._rowcount = len(self._rows)
+        self._description = [(name, neo4j.MIXED, None, None, None, None, True) for name in result['columns']]
+        self._cursor = 0
+        return self
+
+    async def fetchone(self):
+        return _cursor.Cursor.fetchone(self)
+
+    async def fetchmany(self, size=None):
+        return _cursor.Cursor.fetchmany(self, size)
+
+    async def fetchall(self):
+        return _cursor.Cursor.fetchall(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return _cursor.Cursor.fetchone(self)
+        except IndexError:
+            raise StopAsyncIteration()
+
+
+class _HTTPConnection(object):
+
+    """ Just enough of an HTTP/1.1 client to speak to the transactional endpoint over a keep-alive socket. """
+
+    def __init__(self, host, port):
+        self._host = host
+        self._port = port
+        self._reader = None
+        self._writer = None
+
+    async def open(self):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+
+    async def close(self):
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+
+    async def request(self, method, path, body, headers, retries=1):
+        if self._writer is None or self._reader.at_eof():
+            await self.close()
+            await self.open()
+        lines = ["%s %s HTTP/1.1" % (method, path), "Host: %s:%d" % (self._host, self._port),
+                 "Content-Length: %d" % (len(body) if body is not None else 0)]
+        lines.extend("%s: %s" % item for item in headers.items())
+        self._writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+        if body is not None:
+            self._writer.write(body)
+        try:
+            await self._writer.drain()
+            status_line = await self._reader.readline()
+            if not status_line:
+                raise ConnectionResetError("Server closed the connection.")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # A keep-alive socket the server had already closed
+            await self.close()
+            if retries > 0:
+                return await self.request(method, path, body, headers, retries - 1)
+            raise
+
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        response_body = await self._read_body(response_headers)
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, response_headers, response_body
+
+    async def _read_body(self, headers):
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    while (await self._reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass  # Trailers
+                    return b''.join(chunks)
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readexactly(2)
+        if 'content-length' in headers:
+            return await self._reader.readexactly(int(headers['content-length']))
+        body = await self._reader.read()
+        await self.close()
+        return body
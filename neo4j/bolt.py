@@ -0,0 +1,369 @@
+"""
+Bolt, Neo4j's binary protocol, as an alternative to the transactional HTTP endpoint.
+
+neo4j.connect picks this transport for bolt:// DSNs. Values travel as PackStream rather than JSON, so integers,
+floats, byte arrays, nodes, relationships and paths arrive as native values instead of being parsed out of text.
+BoltConnection plugs into the socket and statement hooks of Connection: each thread runs its own transaction on
+its own socket, and statements, including BEGIN and COMMIT, are pipelined so that a commit with pending
+statements takes a single round trip.
+
+Paths are returned as lists alternating between nodes and relationships.
+"""
+import socket
+import struct
+
+import neo4j
+from neo4j.connection import Connection, TX_ENDPOINT
+from neo4j.cursor import Cursor
+from neo4j.jsonstream import TransactionResponse
+from neo4j.packstream import Structure, pack, unpack
+from neo4j.strings import ustr
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+DEFAULT_PORT = 7687
+
+_MAGIC = b'\x60\x60\xB0\x17'
+_VERSIONS = struct.pack('>IIII', 1, 0, 0, 0)
+_CHUNK_SIZE = struct.Struct('>H')
+_MAX_CHUNK = 0xFFFF
+
+# Messages
+INIT = 0x01
+ACK_FAILURE = 0x0E
+RESET = 0x0F
+RUN = 0x10
+DISCARD_ALL = 0x2F
+PULL_ALL = 0x3F
+SUCCESS = 0x70
+RECORD = 0x71
+IGNORED = 0x7E
+FAILURE = 0x7F
+
+# Structures
+NODE = 0x4E
+RELATIONSHIP = 0x52
+UNBOUND_RELATIONSHIP = 0x72
+PATH = 0x50
+
+# Value of the transaction state while a transaction is open. TX_ENDPOINT means none is, as for http.
+_OPEN = 'BEGIN'
+
+_USER_AGENT = 'neo4jdb-python'
+
+
+def hydrate(signature, fields):
+    """ Turns PackStream structures into graph types, as they are unpacked. """
+    if signature == NODE:
+        return neo4j.Node(ustr(fields[0]), fields[1], fields[2])
+    if signature == RELATIONSHIP:
+        return neo4j.Relationship(ustr(fields[0]), fields[3], ustr(fields[1]), ustr(fields[2]), fields[4])
+    if signature == PATH:
+        return _path(*fields)
+    return Structure(signature, fields)
+
+
+def _path(nodes, relationships, sequence):
+    out = [nodes[0]]
+    last = nodes[0]
+    for i in range(0, len(sequence), 2):
+        rel_index, node = sequence[i], nodes[sequence[i + 1]]
+        rel = relationships[abs(rel_index) - 1]
+        start, end = (last, node) if rel_index > 0 else (node, last)
+        rel_id, rel_type, properties = rel.fields
+        out.append(neo4j.Relationship(ustr(rel_id), rel_type, start.id, end.id, properties))
+        out.append(node)
+        last = node
+    return out
+
+
+class BoltSocket(object):
+
+    """ One Bolt session. Connects, negotiates the protocol version and authenticates on first use. """
+
+    def __init__(self, address, auth):
+        self.sock = None
+        self._address = address
+        self._auth = auth
+        self._file = None
+
+    def send(self, messages):
+        """ Writes a list of (signature, fields) messages in one go, without waiting for responses. """
+        if self.sock is None:
+            self._open()
+        self.sock.sendall(b''.join(_frame(m) for m in messages))
+
+    def receive(self):
+        """ Reads the next message, returning (signature, fields). """
+        chunks = []
+        try:
+            while True:
+                size = _CHUNK_SIZE.unpack(self._read(2))[0]
+                if size == 0:
+                    if chunks:
+                        break
+                    continue  # No-op chunk
+                chunks.append(self._read(size))
+        except socket.error as e:
+            self.close()
+            raise Connection.OperationalError("Connection has expired: " + ustr(e))
+        message = unpack(b''.join(chunks), hydrate)
+        return message.signature, message.fields
+
+    def close(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            finally:
+                self.sock = None
+                self._file = None
+
+    def _open(self):
+        sock = socket.create_connection(self._address)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.sendall(_MAGIC + _VERSIONS)
+            self.sock = sock
+            self._file = sock.makefile('rb')
+            if struct.unpack('>I', self._read(4))[0] != 1:
+                raise Connection.NotSupportedError("Server does not support version 1 of the Bolt protocol.")
+            self.sock.sendall(_frame((INIT, [_USER_AGENT, self._auth])))
+            signature, fields = self.receive()
+            if signature != SUCCESS:
+                metadata = fields[0] if fields else {}
+                raise Connection.OperationalError(
+                    ustr(metadata.get('code', 'Unknown')) + ": " + ustr(metadata.get('message', 'Connection refused.')))
+        except Exception:
+            self.close()
+            sock.close()
+            raise
+
+    def _read(self, size):
+        data = self._file.read(size)
+        if len(data) < size:
+            raise socket.error("Server closed the connection.")
+        return data
+
+
+def _frame(message):
+    signature, fields = message
+    data = pack(Structure(signature, fields))
+    out = []
+    for offset in range(0, len(data), _MAX_CHUNK):
+        chunk = data[offset:offset + _MAX_CHUNK]
+        out.append(_CHUNK_SIZE.pack(len(chunk)))
+        out.append(chunk)
+    out.append(b'\x00\x00')
+    return b''.join(out)
+
+
+class BoltResponse(TransactionResponse):
+
+    """
+    The responses to a pipelined list of statements, read off the socket as the results are iterated over. It
+    offers the same interface as the http TransactionResponse, so cursors read both the same way. Statements
+    that are not visible, like BEGIN and COMMIT, have their responses read but produce no result.
+
+    After a failure the server ignores everything up to a RESET, which is sent once the last response has been
+    read. That also rolls back any open transaction, which reset records.
+    """
+
+    def __init__(self, sock, visible, on_complete=None):
+        self.fields = {'errors': []}
+        self.complete = False
+        self.reset = False
+        self._socket = sock
+        self._visible = visible
+        self._on_complete = on_complete
+        self._buffered = None
+        self._remaining = 2 * len(visible)  # Responses to RUN and PULL_ALL/DISCARD_ALL
+        self._events = self._parse()
+        self._current = None
+
+    def detach(self):
+        if self._buffered is None:
+            self._buffered = []
+            while self._remaining > 0:
+                self._buffered.append(self._receive())
+            self._buffered.reverse()
+            if any(signature == FAILURE for signature, _ in self._buffered):
+                # Reset now, the socket is about to be used for something else
+                self._reset()
+
+    def _reset(self):
+        if not self.reset:
+            self._socket.send([(RESET, [])])
+            while self._socket.receive()[0] != SUCCESS:
+                pass
+            self.reset = True
+
+    def _receive(self):
+        if self._buffered:
+            return self._buffered.pop()
+        message = self._socket.receive()
+        if message[0] != RECORD:
+            self._remaining -= 1
+        return message
+
+    def _parse(self):
+        errors = self.fields['errors']
+        for visible in self._visible:
+            signature, fields = self._receive()
+            if signature == FAILURE:
+                errors.append(fields[0])
+            succeeded = signature == SUCCESS
+            if visible and succeeded:
+                yield ('result', {'columns': fields[0].get('fields', [])})
+
+            while True:
+                signature, fields = self._receive()
+                if signature != RECORD:
+                    break
+                if visible:
+                    yield ('row', fields[0])
+            if signature == FAILURE:
+                errors.append(fields[0])
+
+            if visible and succeeded:
+                yield ('end', None)
+
+        if errors:
+            self._reset()
+
+        self.complete = True
+        if self._on_complete is not None:
+            self._on_complete(self)
+
+
+class BoltCursor(Cursor):
+
+    def _map_row(self, row):
+        # Values are hydrated into python and graph types while they are unpacked
+        if self._identities is None:
+            return tuple(row)
+        return tuple([self._identify(value) for value in row])
+
+    def _row_values(self, row):
+        return row
+
+    def _map_column(self, values):
+        if self._identities is None:
+            return list(values)
+        return [self._identify(value) for value in values]
+
+    def _identify(self, value):
+        if isinstance(value, (neo4j.Node, neo4j.Relationship)):
+            return self._identities.add(value)
+        if isinstance(value, list):
+            return [self._identify(v) for v in value]
+        if isinstance(value, dict):
+            return dict((k, self._identify(v)) for k, v in value.items())
+        return value
+
+
+class BoltConnection(Connection):
+
+    _cursor_class = BoltCursor
+    _prefetch_pages = False  # A transaction belongs to one session, pages can only be read from its socket
+
+    def __init__(self, db_uri):
+        Connection.__init__(self, db_uri)
+        uri = urlparse(db_uri)
+        self._address = (uri.hostname, uri.port or DEFAULT_PORT)
+        self._auth = {'scheme': 'none'}
+
+    def authorization(self, username, password):
+        self._auth = {'scheme': 'basic', 'principal': username, 'credentials': password}
+
+    def commit(self):
+        self._messages = []
+        owners = self._gather_pending()
+        pending = [statement for _, statements in owners for statement in statements]
+
+        if self._tx != TX_ENDPOINT or len(pending) > 0:
+            statements = [] if self._tx != TX_ENDPOINT else [('BEGIN', {})]
+            visible = [False] * len(statements) + [True] * len(pending) + [False]
+            statements.extend(pending)
+            statements.append(('COMMIT', {}))
+            self._note_writes(pending)
+            writes = self._state.writes
+            response = self._run(self._socket, statements, visible).read_all()
+            self._deliver(owners, response['results'])
+            self._tx = TX_ENDPOINT
+            self._release_socket()
+            self._invalidate(writes)
+            self._observe_transaction('rollback' if response['errors'] else 'commit')
+            self._handle_errors(response, self, None)
+
+    def rollback(self):
+        self._messages = []
+        self._gather_pending()  # Just used to clear all pending requests
+        if self._tx != TX_ENDPOINT:
+            self._observe_transaction('rollback')
+            try:
+                response = self._run(self._socket, [('ROLLBACK', {})], [False]).finish()
+                self._tx = TX_ENDPOINT
+                self._handle_errors(response.fields, self, None)
+            except self.OperationalError:
+                self._tx = TX_ENDPOINT
+        self._release_socket()
+
+    def _open_socket(self):
+        return BoltSocket(self._address, self._auth)
+
+    def _execute_stream(self, cursor, statements):
+        visible = [True] * len(statements)
+        writes = self._writes(statements)
+        sock = self._socket
+        if cursor._autocommit:
+            if self._tx != TX_ENDPOINT:
+                # Statements sent on this socket would join the open transaction, borrow another one
+                sock = self._borrow_socket()
+        else:
+            self._note_writes(statements)
+            if self._tx == TX_ENDPOINT:
+                statements = [('BEGIN', {})] + list(statements)
+                visible = [False] + visible
+                self._tx = _OPEN
+
+        def on_complete(response):
+            if self._stream is response:
+                self._stream = None
+            if response.reset and not cursor._autocommit:
+                self._tx = TX_ENDPOINT
+            if sock is not self._state.socket:
+                self._return_socket(sock)
+            elif cursor._autocommit:
+                self._release_socket()
+            if cursor._autocommit:
+                self._invalidate(writes)
+            self._handle_errors(response.fields, cursor, cursor)
+
+        response = self._run(sock, statements, visible, on_complete)
+        if sock is self._state.socket:
+            self._stream = response
+        return response
+
+    def _run(self, sock, statements, visible, on_complete=None, retries=1):
+        if sock is self._state.socket and self._stream is not None:
+            # The previous response has not been fully read yet, move it off the socket
+            self._stream.detach()
+            self._stream = None
+
+        messages = []
+        for (statement, parameters), returns_rows in zip(statements, visible):
+            messages.append((RUN, [statement, dict((ustr(k), v) for k, v in parameters.items())]))
+            messages.append((PULL_ALL if returns_rows else DISCARD_ALL, []))
+        try:
+            sock.send(messages)
+        except socket.error as e:
+            sock.close()
+            if retries > 0 and (statements[0][0] == 'BEGIN' or self._tx == TX_ENDPOINT):
+                # Nothing had been sent in this transaction yet, so it is safe to try again
+                return self._run(sock, statements, visible, on_complete, retries - 1)
+            self._tx = TX_ENDPOINT
+            self._handle_error(self, None, Connection.OperationalError, "Connection has expired: " + ustr(e))
+        return BoltResponse(sock, visible, on_complete)
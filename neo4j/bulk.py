@@ -0,0 +1,190 @@
+"""
+Bulk loading of records through the transactional endpoint.
+
+A BulkLoader runs a statement once per record, with the record as its parameters, committing the records in
+batches bounded by count and, optionally, by size. Where the statement can be rewritten to UNWIND a list of
+records, see neo4j.cypher.unwind, a batch is a single statement, and it is sent along with its commit in one
+request. Batches can be loaded concurrently, each in a transaction of its own.
+
+The loader keeps offset, the number of records from the start that have all been committed, and hands it to
+on_commit whenever it moves on. After a failure, loading the same records again from that offset picks up where
+the load stopped:
+
+    >>> loader = BulkLoader(connection, "CREATE (n:User {name:{name}, email:{email}})", batch_size=5000)
+    >>> with open('users.csv') as f:
+    ...     loader.load(csv_records(f), offset=saved_offset)
+
+With concurrency above one, batches after offset may also have been committed when the load failed, and are
+loaded again on resuming, so statements should be idempotent, using MERGE for instance.
+"""
+import csv
+import itertools
+import json
+import sys
+import threading
+
+from neo4j import cypher
+from neo4j.cursor import _batches
+from neo4j.strings import ustr
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+class BulkLoader(object):
+
+    def __init__(self, source, statement, batch_size=1000, max_batch_bytes=None, concurrency=1, on_commit=None):
+        """
+        source is a connection, shared by the loading threads, or a neo4j.pool.ConnectionPool, from which each
+        loading thread checks out a connection of its own. on_commit is called with the new offset, in order,
+        every time it moves on.
+        """
+        self.source = source
+        self.statement = statement
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.concurrency = concurrency
+        self.on_commit = on_commit
+        self.offset = 0
+        self.batches = 0  # Committed during the last load
+        self._unwound = cypher.unwind(statement, 'rows')
+        self._lock = threading.Lock()
+        self._done = {}  # Start -> end of batches committed beyond offset
+        self._error = None
+
+    def load(self, records, offset=0):
+        """
+        Loads records, an iterable of dicts of named or sequences of positional parameters, skipping the first
+        offset of them. Returns the offset reached, the number of records loaded. If a batch fails, batches in
+        flight are left to finish, the rest are not sent, and the error is raised with self.offset telling where
+        to resume from.
+        """
+        self.offset = offset
+        self.batches = 0
+        self._done = {}
+        self._error = None
+        batches = self._numbered(itertools.islice(records, offset, None), offset)
+
+        if self.concurrency <= 1:
+            with _Checkout(self.source) as connection:
+                for start, batch in batches:
+                    self._commit(connection, start, batch)
+                    if self._error is not None:
+                        break
+        else:
+            self._load_concurrently(batches)
+
+        if self._error is not None:
+            raise self._error
+        return self.offset
+
+    def _numbered(self, records, offset):
+        """ Yields (start, batch), the offset of the first record of each batch along with the batch. """
+        start = offset
+        for batch in _batches(records, self.batch_size, self.max_batch_bytes):
+            yield start, batch
+            start += len(batch)
+
+    def _load_concurrently(self, batches):
+        # Bounded, so that records are not read much further ahead than they are loaded
+        work = queue.Queue(self.concurrency * 2)
+        workers = [threading.Thread(target=self._work, args=(work,)) for _ in range(self.concurrency)]
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+        try:
+            for item in batches:
+                if self._error is not None:
+                    break
+                work.put(item)
+        finally:
+            for _ in workers:
+                work.put(None)
+            for worker in workers:
+                worker.join()
+
+    def _work(self, work):
+        try:
+            with _Checkout(self.source) as connection:
+                while True:
+                    item = work.get()
+                    if item is None:
+                        return
+                    if self._error is None:
+                        self._commit(connection, *item)
+        except Exception:
+            self._fail(sys.exc_info()[1])
+            while work.get() is not None:  # Keep the producer from blocking
+                pass
+
+    def _commit(self, connection, start, batch):
+        cursor = connection.cursor()
+        try:
+            if self._unwound is not None:
+                cursor.execute(self._unwound, rows=[dict((ustr(k), v) for k, v in p.items()) for p in batch])
+            else:
+                for parameters in batch:
+                    cursor.execute(self.statement, **dict((ustr(k), v) for k, v in parameters.items()))
+            connection.commit()  # Sends the statements along with the commit
+        except Exception:
+            try:
+                connection.rollback()
+            except connection.Error:
+                pass
+            self._fail(sys.exc_info()[1])
+            return
+        finally:
+            cursor.close()
+        self._committed(start, start + len(batch))
+
+    def _committed(self, start, end):
+        with self._lock:
+            self.batches += 1
+            self._done[start] = end
+            moved = False
+            while self.offset in self._done:
+                self.offset = self._done.pop(self.offset)
+                moved = True
+            if moved and self.on_commit is not None:
+                self.on_commit(self.offset)
+
+    def _fail(self, error):
+        with self._lock:
+            if self._error is None:
+                self._error = error
+
+
+class _Checkout(object):
+
+    """ A connection for the duration of a with block, checked out of a pool if the source is one. """
+
+    def __init__(self, source):
+        self._source = source
+        self._connection = None
+
+    def __enter__(self):
+        if hasattr(self._source, 'acquire'):
+            self._connection = self._source.acquire()
+            return self._connection
+        return self._source
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._connection is not None:
+            self._source.release(self._connection)
+
+
+def csv_records(f, header=True, **fmtparams):
+    """
+    Records of a CSV file: dicts keyed by the column names of its first row, or, without a header, lists of
+    values passed as positional parameters. Values are strings, as in the file.
+    """
+    return csv.DictReader(f, **fmtparams) if header else csv.reader(f, **fmtparams)
+
+
+def ndjson_records(f):
+    """ Records of a newline delimited JSON file, one object per line. """
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
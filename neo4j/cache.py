@@ -0,0 +1,92 @@
+"""
+A client side cache of query results.
+
+Read-only statements executed on cursors created with cached=True are answered from connection.result_cache when
+the same statement was run with the same parameters less than ttl seconds ago. Committed writes invalidate the
+results they may have changed: results of statements that only match labelled nodes are dropped when a write
+touches one of their labels or relationship types, all others whenever anything is written. Writes made by other
+clients are not seen, which the ttl bounds.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from neo4j import cypher
+
+
+class ResultCache(object):
+
+    """
+    Keeps at most max_entries results, and if max_bytes is given, about that many bytes of them as measured by
+    their serialized size. The least recently used results are dropped first.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60, max_bytes=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0  # Counts invalidations, results read before one are not stored after it
+        self._entries = OrderedDict()  # key -> (expires, labels, columns, rows, size)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        """ Approximate number of bytes held. """
+        return self._size
+
+    def key(self, statement, parameters):
+        return cypher.normalize(statement), json.dumps(parameters, sort_keys=True, default=repr)
+
+    def get(self, key):
+        """ Returns (columns, rows) for a key, or None. """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    self._size -= entry[4]
+                self.misses += 1
+                return None
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[2], entry[3]
+
+    def put(self, key, labels, columns, rows, size, generation):
+        """
+        Stores the result of a statement reading labels (None for any), unless the cache has been invalidated
+        since generation.
+        """
+        with self._lock:
+            if generation != self.generation or (self.max_bytes is not None and size > self.max_bytes):
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[4]
+            self._entries[key] = (time.time() + self.ttl, labels, columns, rows, size)
+            self._size += size
+            while len(self._entries) > self.max_entries or \
+                    (self.max_bytes is not None and self._size > self.max_bytes):
+                _, entry = self._entries.popitem(last=False)
+                self._size -= entry[4]
+
+    def invalidate(self, labels=None):
+        """ Drops results that may depend on labels or relationship types, or all results if labels is None. """
+        with self._lock:
+            self.generation += 1
+            if labels is None:
+                self._entries.clear()
+                self._size = 0
+                return
+            for key, entry in list(self._entries.items()):
+                if entry[1] is None or entry[1] & labels:
+                    del self._entries[key]
+                    self._size -= entry[4]
+
+    def clear(self):
+        self.invalidate(None)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,95 @@
+"""
+Compressed request and response bodies for the http transport, see Connection.compress().
+
+Responses are decompressed as they are read, so streaming cursors still decode rows as soon as they have arrived.
+Request bodies above a size threshold are sent gzipped. Stats counts the bytes that went over the wire against
+the bytes they stand for.
+"""
+import threading
+import zlib
+
+ENCODINGS = ('gzip', 'deflate')
+
+DEFAULT_CHUNK_SIZE = 8192
+
+
+class Stats(object):
+
+    def __init__(self):
+        self.request_bytes = 0  # Before compression
+        self.request_bytes_sent = 0
+        self.response_bytes = 0  # After decompression
+        self.response_bytes_received = 0
+        self._lock = threading.Lock()
+
+    @property
+    def saved(self):
+        """ Bytes that did not have to be sent or received thanks to compression. """
+        return (self.request_bytes - self.request_bytes_sent) + (self.response_bytes - self.response_bytes_received)
+
+    def _add_request(self, size, sent):
+        with self._lock:
+            self.request_bytes += size
+            self.request_bytes_sent += sent
+
+    def _add_response(self, size, received):
+        with self._lock:
+            self.response_bytes += size
+            self.response_bytes_received += received
+
+
+def compress(data, level=6):
+    """ Gzips data. """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class DecompressingReader(object):
+
+    """
+    Wraps the file-like body of a response sent with a Content-Encoding of gzip or deflate, giving read() access
+    to the decompressed body.
+    """
+
+    def __init__(self, fp, encoding, stats=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        # Deflate is meant to be zlib wrapped, but some servers send raw deflate data, which is tried on failure
+        self._wbits = 16 + zlib.MAX_WBITS if encoding == 'gzip' else zlib.MAX_WBITS
+        self._decompressor = zlib.decompressobj(self._wbits)
+        self._fp = fp
+        self._stats = stats
+        self._chunk_size = chunk_size
+        self._buf = b''
+        self._eof = False
+        self._started = False
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._buf
+            while not self._eof:
+                data += self._decompress(None)
+            self._buf = b''
+            return data
+        while not self._eof and len(self._buf) < size:
+            self._buf += self._decompress(max(self._chunk_size, size - len(self._buf)))
+        data, self._buf = self._buf[:size], self._buf[size:]
+        return data
+
+    def _decompress(self, size):
+        """ Reads up to size bytes, or the rest of the body, returning them decompressed. """
+        chunk = self._fp.read() if size is None else self._fp.read(size)
+        if not chunk:
+            data = self._decompressor.flush()
+            self._eof = True
+        else:
+            try:
+                data = self._decompressor.decompress(chunk)
+            except zlib.error:
+                if self._started or self._wbits != zlib.MAX_WBITS:
+                    raise
+                self._wbits = -zlib.MAX_WBITS
+                self._decompressor = zlib.decompressobj(self._wbits)
+                data = self._decompressor.decompress(chunk)
+        self._started = True
+        if self._stats is not None:
+            self._stats._add_response(len(data), len(chunk))
+        return data
@@ -1,8 +1,18 @@
 
-import json
 import base64
-
-from neo4j.cursor import Cursor
+import select
+import socket
+import threading
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+from neo4j import compression, cypher, jsoncodec
+from neo4j.cursor import Cursor, IdentityMap
+from neo4j.instrumentation import _CountingReader, _Probe
+from neo4j.jsonstream import TransactionResponse
+from neo4j.keepalive import KeepAlive
+from neo4j.paging import PagedResponse
+from neo4j.prepared import PreparedStatement, StatementCache
 from neo4j.strings import ustr
 
 try:
@@ -16,6 +26,27 @@ except ImportError:
 
 TX_ENDPOINT = "/db/data/transaction"
 
+RESULT_FORMATS = ('rest', 'row', 'graph')
+
+IDENTITY_MAP_SCOPES = (None, 'result', 'transaction')
+
+
+def _is_readable(connection):
+    sock = getattr(connection, 'sock', None)
+    if sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (ValueError, socket.error):
+        return True
+    return len(readable) > 0
+
+
+def _parse_expiry(value):
+    """ Seconds since the epoch from the RFC 1123 date of transaction.expires, or None. """
+    parsed = parsedate_tz(value) if value else None
+    return mktime_tz(parsed) if parsed is not None else None
+
 
 def neo_code_to_error_class(code):
     if code.startswith('Neo.ClientError.Schema'):
@@ -25,6 +56,24 @@ def neo_code_to_error_class(code):
     return Connection.InternalError
 
 
+class _TransactionState(threading.local):
+    """
+    The part of a connection that is private to each thread using it: the open transaction, the socket it
+    runs on, a response still being read, a page being fetched ahead in it, the messages of the last call and the
+    identity map of the transaction.
+    """
+    tx = TX_ENDPOINT
+    socket = None
+    stream = None
+    identities = None
+    prefetch = None
+    probe = None  # Of the last request sent, until its body is read
+    writes = frozenset()  # What the transaction wrote to, for the result cache: labels, or None for anything
+
+    def __init__(self):
+        self.messages = []
+
+
 def default_error_handler(connection, cursor, errorclass, errorvalue):
     if errorclass != Connection.Warning:
         raise errorclass(errorvalue)
@@ -62,42 +111,83 @@ class Connection(object):
     class NotSupportedError(DatabaseError):
         pass
 
+    _cursor_class = Cursor
+    _prefetch_pages = True
+
     _COMMON_HEADERS = {"Content-Type": "application/json", "Accept": "application/json", "Connection": "keep-alive"}
 
     def __init__(self, db_uri):
         self.errorhandler = default_error_handler
         self._host = urlparse(db_uri).netloc
-        self._http = http.HTTPConnection(self._host)
-        self._tx = TX_ENDPOINT
-        self._messages = []
+        self._headers = dict(self._COMMON_HEADERS)
+        self._state = _TransactionState()
+        self._lock = threading.RLock()
+        self._idle_sockets = []
+        self._all_sockets = set()
+        self._closed = False
         self._cursors = set()
         self._cursor_ids = 0
+        self._statements = StatementCache()
+        self.result_cache = None
+        self.codec = jsoncodec.get()
+        self.compression_stats = compression.Stats()
+        self.observers = []  # See neo4j.instrumentation
+        self._compress_above = None
+        self._keep_alive = None
+        self._activity = threading.Condition()
+        self._expiries = {}  # Transaction url -> when the server will time it out
+        self._busy = {}  # Transaction url -> number of requests in flight
+        self._touching = set()  # Transaction urls a keep-alive request is being sent in
 
     def authorization(self, username, password):
         basic_auth = '%s:%s' % (username, password)
-        try:  # Python 2
-            auth = base64.encodestring(basic_auth)
-        except TypeError:  # Python 3
-            auth = base64.encodestring(bytes(basic_auth, 'utf-8')).decode()
-        self._COMMON_HEADERS.update({"Authorization": "Basic %s" % auth.strip()})
+        auth = base64.b64encode(basic_auth.encode('utf-8')).decode('ascii')
+        self._headers["Authorization"] = "Basic %s" % auth
+
+    def compress(self, responses=True, requests_above=None):
+        """
+        Asks the server for gzip or deflate compressed responses, which are decompressed as they are read, and
+        gzips request bodies of requests_above bytes or more if given. compression_stats counts the bytes saved.
+        Compressed requests need a server that accepts them. Only applies to http, Bolt has a binary encoding.
+        """
+        if responses:
+            self._headers['Accept-Encoding'] = ', '.join(compression.ENCODINGS)
+        else:
+            self._headers.pop('Accept-Encoding', None)
+        self._compress_above = requests_above
 
     def commit(self):
         self._messages = []
-        pending = self._gather_pending()
-        
+        owners = self._gather_pending()
+        pending = [statement for _, statements in owners for statement in statements]
+
         if self._tx != TX_ENDPOINT or len(pending) > 0:
             payload = None
             if len(pending) > 0:
-                payload = {'statements': [{'statement': s, 'parameters': p} for (s, p) in pending]}
+                payload = {'statements': [{'statement': s, 'parameters': p, 'resultDataContents': [c._result_format]}
+                                          for c, statements in owners for (s, p) in statements]}
+            self._note_writes(pending)
+            writes = self._state.writes
+            self._enter_tx(self._tx)
             response = self._deserialize(self._http_req("POST", self._tx + "/commit", payload))
+            self._deliver(owners, response.get('results', []))
             self._tx = TX_ENDPOINT
+            self._release_socket()
+            self._invalidate(writes)
+            self._observe_transaction('rollback' if response['errors'] else 'commit')
             self._handle_errors(response, self, None)
 
     def rollback(self):
         self._messages = []
         self._gather_pending()  # Just used to clear all pending requests
+        if self._tx != TX_ENDPOINT:
+            self._observe_transaction('rollback')
+        expires = self.expires
+        if expires is not None and expires < time.time():
+            self._tx = TX_ENDPOINT  # Rolled back by the server already
         if self._tx != TX_ENDPOINT:
             try:
+                self._enter_tx(self._tx)
                 response = self._deserialize(self._http_req("DELETE", self._tx))
                 self._tx = TX_ENDPOINT
                 self._handle_errors(response, self, None)
@@ -105,18 +195,145 @@ class Connection(object):
                 # Neo.ClientError.Transaction.UnknownId
                 # Unrecognized transaction id. Transaction may have timed out and been rolled back.
                 pass
+        self._release_socket()
+
+    def prepare(self, statement, warm=False):
+        """
+        Returns a PreparedStatement for a statement, to pass to cursor.execute() in place of its text. Statements
+        are prepared once per connection and counted in the statement cache, see statements. Preparing a statement
+        with literals that look like they should be parameters adds a Warning to messages. With warm, the server
+        plans the statement right away, see warm().
+        """
+        self._messages = []
+        prepared, created = self._statements.prepare(statement)
+        if created and prepared.literals:
+            self._handle_error(self, None, self.Warning, "Statement has literals that could be parameters, which "
+                               "keeps the server from reusing its plan: " + ", ".join(prepared.literals))
+        if warm:
+            self.warm([prepared])
+        return prepared
+
+    def warm(self, statements):
+        """ Has the server plan statements ahead of their first use, EXPLAINing them all in one round trip. """
+        cursor = self.cursor(autocommit=True, batch=True)
+        try:
+            for statement in statements:
+                if not isinstance(statement, PreparedStatement):
+                    statement = self.prepare(statement)
+                cursor.execute("EXPLAIN " + statement.statement)
+            cursor.fetchall()
+        finally:
+            cursor.close()
+
+    @property
+    def statements(self):
+        """ The StatementCache of prepared statements, with hit and miss counts. """
+        return self._statements
+
+    def cursor(self, stream=False, batch=False, autocommit=False, result_format='rest', identity_map=None,
+               page_size=None, cached=False, read_only=False):
+        """
+        Returns a new cursor. A streaming cursor maps result rows one at a time as they are read off the
+        network instead of downloading the whole result first; it can only be scrolled forward, and its
+        rowcount is -1 until all rows have been fetched.
+
+        Statements executed on a cursor are sent together the first time a result is needed. A batch cursor
+        keeps the result set of every statement sent, positioned on the first one, and nextset() moves on to
+        the next. Other cursors only keep the result of the last statement.
 
-    def cursor(self):
+        An autocommit cursor runs each set of statements it sends in a transaction of its own, which is opened
+        and committed by a single request. It is not part of, and does not affect, the transaction of the
+        connection.
+
+        A read_only cursor runs statements that do not write like an autocommit cursor while the calling thread
+        has no transaction open, which saves opening a transaction only to roll it back. Other statements join the
+        transaction of the connection as usual.
+
+        result_format picks the representation the server sends results in:
+
+        - 'rest', the default, maps nodes and relationships to Node and Relationship. It is the largest format,
+          every node and relationship carries a set of REST urls.
+        - 'row' sends values only. Nodes and relationships arrive as plain dicts of their properties, without
+          ids, labels or types, which makes it by far the smallest format for queries returning scalars.
+        - 'graph' makes every row a (nodes, relationships) tuple of the Node and Relationship objects in the
+          row, each element once, and describes the two columns as 'nodes' and 'relationships'.
+
+        Bolt connections always send native values and ignore result_format.
+
+        With an identity_map, each node and relationship is mapped to one object however often it occurs, and
+        cursor.graph holds the distinct elements seen. The map lasts for a result set with 'result', or for the
+        transaction with 'transaction', shared by the cursors of the calling thread.
+
+        A paged cursor reads the result of its last statement page_size rows at a time, fetching the next page
+        in the background while the current one is being read; it is forward only like a streaming cursor. Paging
+        rewrites the statement with SKIP and LIMIT, so it should order its rows. Statements that write, or have a
+        SKIP or LIMIT of their own, are run in one go instead.
+
+        Statements executed on cursors of the connection whose results have not been asked for by the time it is
+        committed are sent along with the commit, and the cursors read their results from its response. A
+        transaction that only looks at its results once committed so takes a single request.
+
+        A cached cursor answers read-only statements, executed one at a time, from result_cache if it is set and
+        the transaction has not written anything yet. See neo4j.cache.ResultCache.
+        """
+        if result_format not in RESULT_FORMATS:
+            raise self.NotSupportedError("Unknown result format: %s" % result_format)
+        if identity_map not in IDENTITY_MAP_SCOPES:
+            raise self.NotSupportedError("Unknown identity map scope: %s" % identity_map)
+        if page_size is not None and (stream or batch):
+            raise self.NotSupportedError("Paged cursors cannot also be streaming or batch cursors.")
         self._messages = []
-        cursor = Cursor(self._next_cursor_id(), self, self._execute)
-        self._cursors.add(cursor)
+        execute_stream = self._execute_stream if stream else None
+        if page_size is not None:
+            execute_stream = lambda c, statements: PagedResponse(self, c, statements, page_size)
+        cursor = self._cursor_class(self._next_cursor_id(), self, self._execute, execute_stream, batch)
+        cursor._state = self._state
+        cursor._autocommit = autocommit
+        cursor._result_format = result_format
+        cursor._identity_map = identity_map
+        cursor._cached = cached
+        cursor._read_only = read_only
+        with self._lock:
+            self._cursors.add(cursor)
         return cursor
 
+    def keep_alive(self, margin=10, interval=1):
+        """
+        Keeps the transactions of this connection from timing out while they are idle: every interval seconds, a
+        background thread sends an empty request in each transaction that would expire within margin seconds.
+        Pass None as margin to stop it again. Bolt transactions do not time out, this only applies to http.
+        """
+        if self._keep_alive is not None:
+            self._keep_alive.stop()
+            self._keep_alive = None
+        if margin is not None:
+            self._keep_alive = KeepAlive(self, margin, interval)
+
+    @property
+    def expires(self):
+        """
+        When, in seconds since the epoch, the server will roll back the transaction of the calling thread unless it
+        sees another request in it, or None if there is no open transaction or its expiry is not known.
+        """
+        with self._activity:
+            return self._expiries.get(self._tx)
+
     def close(self):
+        if not hasattr(self, '_lock'):
+            return  # __init__ failed
+        if self._keep_alive is not None:
+            self._keep_alive.stop()
+            self._keep_alive = None
         self._messages = []
-        if hasattr(self, '_http') and self._http is not None:
-            self._http.close()
-            self._http = None
+        self._stream = None
+        with self._lock:
+            self._closed = True
+            sockets = list(self._all_sockets)
+            self._all_sockets.clear()
+            self._idle_sockets = []
+        for connection in sockets:
+            connection.close()
+        self._state.socket = None
 
     def __del__(self):
         self.close()
@@ -125,53 +342,346 @@ class Connection(object):
     def messages(self):
         return self._messages
 
+    #
+    # Per thread state. Each thread sharing this connection runs its own transaction, on its own socket.
+    #
+
+    @property
+    def _tx(self):
+        return self._state.tx
+
+    @_tx.setter
+    def _tx(self, value):
+        previous = self._state.tx
+        self._state.tx = value
+        if previous == TX_ENDPOINT and value != TX_ENDPOINT:
+            self._observe_transaction('begin')
+        if value == TX_ENDPOINT:
+            self._state.identities = None
+            self._state.writes = frozenset()
+            if previous != TX_ENDPOINT:
+                self._forget_tx(previous)
+
+    @property
+    def _stream(self):
+        return self._state.stream
+
+    @_stream.setter
+    def _stream(self, value):
+        self._state.stream = value
+
+    @property
+    def _messages(self):
+        return self._state.messages
+
+    @_messages.setter
+    def _messages(self, value):
+        self._state.messages = value
+
+    @property
+    def _socket(self):
+        """ The socket of the calling thread, taken from the idle sockets or opened on first use. """
+        state = self._state
+        if state.socket is None:
+            with self._lock:
+                if self._closed:
+                    raise self.InterfaceError("Connection is closed.")
+                if self._idle_sockets:
+                    state.socket = self._idle_sockets.pop()
+                else:
+                    state.socket = self._open_socket()
+                    self._all_sockets.add(state.socket)
+        return state.socket
+
+    def _in_transaction(self):
+        """ True if the calling thread has a transaction open. """
+        return self._tx != TX_ENDPOINT
+
+    def _transaction_identities(self):
+        """ The identity map of the transaction of the calling thread. """
+        state = self._state
+        if state.identities is None:
+            state.identities = IdentityMap()
+        return state.identities
+
+    def _open_socket(self):
+        return http.HTTPConnection(self._host)
+
+    def _borrow_socket(self):
+        """ Takes a socket for a single request that is not sent from the socket of the calling thread. """
+        with self._lock:
+            if self._closed:
+                raise self.InterfaceError("Connection is closed.")
+            if self._idle_sockets:
+                return self._idle_sockets.pop()
+            sock = self._open_socket()
+            self._all_sockets.add(sock)
+            return sock
+
+    def _return_socket(self, sock):
+        with self._lock:
+            if not self._closed:
+                self._idle_sockets.append(sock)
+
+    def _release_socket(self):
+        """ Hands the socket of the calling thread back once its transaction is over. """
+        state = self._state
+        if state.socket is not None and state.stream is None and state.tx == TX_ENDPOINT:
+            with self._lock:
+                if not self._closed:
+                    self._idle_sockets.append(state.socket)
+            state.socket = None
+
+    def _close_stale(self):
+        """
+        Closes idle sockets the server has closed its end of, checking without a round trip: an idle socket
+        that is readable has either reached EOF or holds data nobody asked for.
+        """
+        with self._lock:
+            stale = [c for c in self._idle_sockets if _is_readable(c)]
+            for connection in stale:
+                self._idle_sockets.remove(connection)
+                self._all_sockets.discard(connection)
+        for connection in stale:
+            connection.close()
+
+    def _reset_socket(self):
+        """ Drops the socket of the calling thread, a new one is opened on the next request. """
+        state = self._state
+        state.stream = None
+        if state.socket is not None:
+            with self._lock:
+                self._all_sockets.discard(state.socket)
+            state.socket.close()
+            state.socket = None
+
     def _next_cursor_id(self):
-        self._cursor_ids += 1
-        return self._cursor_ids
+        with self._lock:
+            self._cursor_ids += 1
+            return self._cursor_ids
 
     def _gather_pending(self):
-        pending = []
-        for cursor in self._cursors:
-            if len(cursor._pending) > 0:
-                pending.extend(cursor._pending)
-                cursor._pending = []
-        return pending
+        """ Takes the statements queued on cursors of the calling thread, as a list of (cursor, statements). """
+        state = self._state
+        owners = []
+        with self._lock:
+            cursors = [c for c in self._cursors if c._state is state and not c._autocommit and len(c._pending) > 0]
+        cursors.sort(key=lambda c: c._id)
+        for cursor in cursors:
+            owners.append((cursor, cursor._pending))
+            cursor._pending = []
+        return owners
+
+    def _deliver(self, owners, results):
+        """ Hands the results of statements sent with a commit to the cursors they were executed on. """
+        for cursor, statements in owners:
+            cursor._load_results(results[:len(statements)])
+            results = results[len(statements):]
+
+    def _forget_cursor(self, cursor):
+        with self._lock:
+            self._cursors.discard(cursor)
 
     def _execute(self, cursor, statements):
         """"
-        Executes a list of statements, returning an iterator of results sets. Each 
+        Executes a list of statements, returning a list with the result set of each of them. Each
         statement should be a tuple of (statement, params).
         """
-        payload = [{'statement': s, 'parameters': p, 'resultDataContents':['rest']} for (s, p) in statements]
-        http_response = self._http_req("POST", self._tx, {'statements': payload})
-
-        if self._tx == TX_ENDPOINT:
-            self._tx = http_response.getheader('Location')
-
-        response = self._deserialize(http_response)
-
-        self._handle_errors(response, cursor, cursor)
+        response = self._execute_stream(cursor, statements).read_all()
+        return response['results']
 
-        return response['results'][-1]
+    def _execute_stream(self, cursor, statements):
+        """
+        Executes a list of statements, returning a TransactionResponse that decodes the result
+        sets as they are read. Errors are handled once the end of the response has been read.
+        """
+        contents = [cursor._result_format]
+        payload = [{'statement': s, 'parameters': p, 'resultDataContents': contents} for (s, p) in statements]
+        writes = self._writes(statements)
+        tx = None
+        if cursor._autocommit:
+            http_response = self._http_req("POST", TX_ENDPOINT + "/commit", {'statements': payload})
+        else:
+            self._note_writes(statements)
+            tx = self._tx
+            if tx != TX_ENDPOINT:
+                self._enter_tx(tx)  # Until the response has been read
+            try:
+                http_response = self._http_req("POST", tx, {'statements': payload})
+            except Exception:
+                self._leave_tx(tx)
+                raise
+            if tx == TX_ENDPOINT:
+                tx = self._tx = http_response.getheader('Location')
+                self._enter_tx(tx)
+
+        def on_complete(response):
+            if self._stream is response:
+                self._stream = None
+            if cursor._autocommit:
+                self._release_socket()
+                self._invalidate(writes)
+            else:
+                self._note_expiry(tx, response.fields)
+                self._leave_tx(tx)
+            self._handle_errors(response.fields, cursor, cursor)
+
+        self._stream = TransactionResponse(self._body(http_response), on_complete=on_complete, codec=self.codec)
+        return self._stream
+
+    def _execute_detached(self, cursor, tx, statements):
+        """
+        Executes statements in the transaction at tx, or in one of their own if tx is None, on a borrowed socket
+        rather than the one of the calling thread. Returns the response document; errors are left to the caller.
+        """
+        payload = [{'statement': s, 'parameters': p, 'resultDataContents': [cursor._result_format]}
+                   for (s, p) in statements]
+        path = tx if tx is not None else TX_ENDPOINT + "/commit"
+        sock = self._borrow_socket()
+        try:
+            probe = _Probe(self.observers, "POST", path) if self.observers else None
+            body, headers = self._encode(self.codec.dumps({'statements': payload}))
+            if probe is not None:
+                probe.bytes_sent = len(body)
+                probe.mark('encode')
+            sock.request("POST", path, body, headers)
+            http_response = sock.getresponse()
+            if probe is not None:
+                probe.status = http_response.status
+                probe.mark('wait')
+                self._state.probe = probe
+            if not http_response.status in [200, 201]:
+                raise self.OperationalError("Server returned unexpected response: " + ustr(http_response.status) +
+                                            ustr(self._body(http_response).read()))
+            response = TransactionResponse(self._body(http_response), codec=self.codec).read_all()
+        except Exception:
+            with self._lock:
+                self._all_sockets.discard(sock)
+            sock.close()
+            raise
+        self._return_socket(sock)
+        if tx is not None:
+            self._note_expiry(tx, response)
+        return response
+
+    #
+    # Transaction expiry, see neo4j.keepalive
+    #
+
+    def _note_expiry(self, tx, response):
+        """ Records when the server will time out the transaction at tx, as reported in a response in it. """
+        expires = _parse_expiry(response.get('transaction', {}).get('expires'))
+        if expires is not None:
+            with self._activity:
+                if tx == self._tx or tx in self._expiries:
+                    self._expiries[tx] = expires
+
+    def _forget_tx(self, tx):
+        with self._activity:
+            self._expiries.pop(tx, None)
+            self._busy.pop(tx, None)
+
+    def _enter_tx(self, tx):
+        """ Notes a request in flight in the transaction at tx, once no keep-alive request is being sent in it. """
+        with self._activity:
+            while tx in self._touching:
+                self._activity.wait()
+            self._busy[tx] = self._busy.get(tx, 0) + 1
+
+    def _leave_tx(self, tx):
+        with self._activity:
+            count = self._busy.pop(tx, 0) - 1
+            if count > 0:
+                self._busy[tx] = count
+
+    def _touch_expiring(self, margin):
+        """ Sends an empty request in every idle transaction that expires within margin seconds. """
+        deadline = time.time() + margin
+        with self._activity:
+            due = [tx for tx, expires in self._expiries.items() if expires < deadline and tx not in self._busy]
+            self._touching.update(due)
+        for tx in due:
+            try:
+                response = self._execute_detached(None, tx, [])
+                if len(response['errors']) > 0:
+                    self._forget_tx(tx)  # Timed out or rolled back already
+            except Exception:
+                pass  # The next request in the transaction reports a broken connection
+            finally:
+                with self._activity:
+                    self._touching.discard(tx)
+                    self._activity.notify_all()
+
+    def _await_prefetch(self):
+        """ Waits for a page being fetched ahead in the transaction of the calling thread. """
+        prefetch = self._state.prefetch
+        if prefetch is not None:
+            prefetch.wait()
 
     def _http_req(self, method, path, payload=None, retries=2):
-        serialized_payload = json.dumps(payload) if payload is not None else None
+        probe = _Probe(self.observers, method, path) if self.observers else None
+        serialized_payload, headers = self._encode(self.codec.dumps(payload) if payload is not None else None)
+        if probe is not None:
+            probe.bytes_sent = len(serialized_payload or b'')
+            probe.mark('encode')
+        self._await_prefetch()
+
+        if self._stream is not None:
+            # The previous response has not been fully read yet, move it off the socket
+            self._stream.detach()
+            self._stream = None
 
         try:
-            self._http.request(method, path, serialized_payload, self._COMMON_HEADERS)
-            http_response = self._http.getresponse()
-        except (http.BadStatusLine, http.CannotSendRequest):
-            self._http = http.HTTPConnection(self._host)
+            connection = self._socket
+            connection.request(method, path, serialized_payload, headers)
+            http_response = connection.getresponse()
+        except (http.BadStatusLine, http.CannotSendRequest) as e:
+            self._reset_socket()
             if retries > 0:
+                for observer in self.observers:
+                    observer.request_retried(method, path, e)
                 return self._http_req(method, path, payload, retries-1)
             self._handle_error(self, None, Connection.OperationalError, "Connection has expired.")
 
+        if probe is not None:
+            probe.status = http_response.status
+            probe.mark('wait')
+            self._state.probe = probe
+
         if not http_response.status in [200, 201]:
-            message = "Server returned unexpected response: " + ustr(http_response.status) + ustr(http_response.read())
+            message = "Server returned unexpected response: " + ustr(http_response.status) + \
+                ustr(self._body(http_response).read())
             self._handle_error(self, None, Connection.OperationalError, message)
 
         return http_response
 
+    #
+    # Result cache invalidation
+    #
+
+    def _writes(self, statements):
+        """ What statements write to: no labels if they only read, None if they may write anything. """
+        written = frozenset()
+        if self.result_cache is not None:
+            for statement, _ in statements:
+                if cypher.writes(statement):
+                    labels = cypher.labels(statement)
+                    if labels is None:
+                        return None
+                    written |= labels
+        return written
+
+    def _note_writes(self, statements):
+        """ Adds what statements sent in the transaction of the calling thread write to what it has written. """
+        state = self._state
+        if state.writes is not None:
+            writes = self._writes(statements)
+            state.writes = None if writes is None else state.writes | writes
+
+    def _invalidate(self, writes):
+        if self.result_cache is not None and (writes is None or len(writes) > 0):
+            self.result_cache.invalidate(writes)
+
     def _handle_errors(self, response, owner, cursor):
         for error in response['errors']:
             error_class = neo_code_to_error_class(error['code'])
@@ -179,14 +689,42 @@ class Connection(object):
             self._handle_error(owner, cursor, error_class, error_value)
 
     def _handle_error(self, owner, cursor, error_class, error_value):
-        if error_class.rollback:
+        if error_class.rollback and not (cursor is not None and cursor._autocommit):
+            if self._tx != TX_ENDPOINT:
+                self._observe_transaction('rollback')
             self._tx = TX_ENDPOINT
             self._gather_pending()  # Just used to clear all pending requests
         owner._messages.append((error_class, error_value))
         owner.errorhandler(self, cursor, error_class, error_value)
 
+    def _encode(self, body):
+        """ Returns a request body, compressed if it is large enough, and the headers to send it with. """
+        if body is None or self._compress_above is None or len(body) < self._compress_above:
+            return body, self._headers
+        compressed = compression.compress(body)
+        self.compression_stats._add_request(len(body), len(compressed))
+        headers = dict(self._headers)
+        headers['Content-Encoding'] = 'gzip'
+        return compressed, headers
+
+    def _body(self, http_response):
+        """
+        The body of the response to the last request of the calling thread as a file-like object, decompressing it
+        if it was sent compressed.
+        """
+        encoding = (http_response.getheader('Content-Encoding') or '').strip().lower()
+        body = http_response
+        probe = self._state.probe
+        if probe is not None:
+            self._state.probe = None
+            body = _CountingReader(body, probe)
+        if encoding in compression.ENCODINGS:
+            return compression.DecompressingReader(body, encoding, self.compression_stats)
+        return body
+
+    def _observe_transaction(self, event):
+        for observer in self.observers:
+            observer.transaction(event)
+
     def _deserialize(self, response):
-        # TODO: This is exceptionally annoying, python 3 has improved byte array handling, but that means the JSON
-        # parser no longer supports deserializing these things in a streaming manner, so we have to decode the whole
-        # thing first.
-        return json.loads(response.read().decode('utf-8'))
+        return self.codec.loads(self._body(response).read())
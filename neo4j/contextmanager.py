@@ -1,5 +1,6 @@
 from contextlib import contextmanager
 from neo4j import connect
+from neo4j.pool import ConnectionPool
 
 
 class Neo4jDBConnectionManager:
@@ -10,15 +11,20 @@ class Neo4jDBConnectionManager:
 
     Neo4jDBConnectionManager.read()
     When using with Neo4jDBConnectionManager.read(): we will always rollback the transaction. All exceptions will be
-    thrown.
+    thrown. Statements that only read are sent without opening a transaction, so there is nothing to roll back and
+    each costs a single request.
 
     Neo4jDBConnectionManager.write()
     When using with Neo4jDBConnectionManager.write() we will always commit the transaction except when we see an
     exception. If we get an exception we will rollback the transaction and throw the exception.
 
     Neo4jDBConnectionManager.transaction()
-    When we don't want to share a connection (transaction context) we can set up a new connection which will work
-    just as the write context manager above but with it's own connection.
+    When we don't want to share a connection (transaction context) we check a connection out of a pool, which will
+    work just as the write context manager above but with it's own connection. The pool keeps at most pool_size
+    connections, waiting up to pool_timeout seconds for one to become free, and closes connections that have been
+    idle for pool_idle_ttl seconds. See neo4j.pool.ConnectionPool.
+
+    Given a cache, a neo4j.cache.ResultCache, all connections share it and read() answers repeated reads from it.
 
     >>> manager = Neo4jDBConnectionManager("http://localhost:7474")
     >>> with manager.write() as w:
@@ -38,13 +44,17 @@ class Neo4jDBConnectionManager:
     ...     w.execute("CREATE (TheMatrix:Movie {title:'Matrix Revolutions', tagline:'Everything that has a beginning has an end.'})")
     """
 
-    def __init__(self, dsn, username=None, password=None):
+    def __init__(self, dsn, username=None, password=None, pool_size=10, pool_timeout=None, pool_idle_ttl=300,
+                 cache=None):
         self.dsn = dsn
         self.connection = connect(dsn, username, password)
+        self.connection.result_cache = cache
+        self.pool = ConnectionPool(dsn, username, password, max_size=pool_size, timeout=pool_timeout,
+                                   idle_ttl=pool_idle_ttl, result_cache=cache)
 
     @contextmanager
     def _read(self):
-        cursor = self.connection.cursor()
+        cursor = self.connection.cursor(cached=True, read_only=True)
         try:
             yield cursor
         finally:
@@ -70,7 +80,7 @@ class Neo4jDBConnectionManager:
 
     @contextmanager
     def _transaction(self):
-        connection = connect(self.dsn)
+        connection = self.pool.acquire()
         cursor = connection.cursor()
         try:
             yield cursor
@@ -81,5 +91,5 @@ class Neo4jDBConnectionManager:
             connection.commit()
         finally:
             cursor.close()
-            connection.close()
+            self.pool.release(connection)
     transaction = property(_transaction)
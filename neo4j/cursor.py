@@ -1,56 +1,170 @@
 
+import json
+import time
+from collections import OrderedDict
+
 import neo4j
-from neo4j.strings import ustr
+from neo4j import cypher
+from neo4j.prepared import PreparedStatement
+from neo4j.strings import ustr, unicode_type
+
+try:
+    _SCALARS = frozenset([type(None), bool, int, long, float, unicode_type])
+    _INTEGERS = frozenset([int, long])
+except NameError:
+    _SCALARS = frozenset([type(None), bool, int, float, str])  # Python 3
+    _INTEGERS = frozenset([int])
 
 
 class Cursor(object):
 
-    def __init__( self, cursorid, connection, execute_statements ):
+    def __init__( self, cursorid, connection, execute_statements, stream_statements=None, batch=False ):
         self.connection = connection
         self.lastrowid = None
         self.arraysize = 1
         self.errorhandler = connection.errorhandler
 
         self._id = cursorid
+        self._state = None
+        self._autocommit = False
+        self._result_format = 'rest'
+        self._cached = False
+        self._read_only = False
 
         self._pending = []
         self._execute = execute_statements
+        self._execute_stream = stream_statements
+        self._batch = batch
+        self._sets = []
+        self._response = None
+        self._stream_sets = None
+        self._stream_remaining = 0
+        self._result = None
         self._rows = None
         self._rowcount = -1
         self._cursor = 0
         self._messages = []
+        self._mapper = None
+        self._identity_map = None
+        self._identities = None
 
     def execute(self, statement, *args, **kwargs):
         for i in range(len(args)):
             kwargs[i] = args[i]
+        if isinstance(statement, PreparedStatement):
+            statement = statement._executed(kwargs)
 
         self._messages = []
+        self._discard_stream()
+        self._sets = []
         self._rows = None
         self._rowcount = 0
+        self._mapper = None
 
         self._pending.append((statement, kwargs))
         return self
 
+    def executemany(self, statement, seq_of_parameters, batch_size=1000, max_batch_bytes=None):
+        """
+        Executes a statement once for each parameter set, a dict of named or a sequence of positional
+        parameters. The parameter sets are sent in batches of at most batch_size sets and, if given, about
+        max_batch_bytes of serialized parameters, one request per batch.
+
+        Where it is safe to do so, the statement is rewritten to UNWIND the batch, so that the server plans
+        and runs it once per batch rather than once per parameter set. Statements that are executed but not
+        yet sent are sent along with the first batch. Results are discarded and rowcount is -1.
+        """
+        self._messages = []
+        self._discard_stream()
+        self._sets = []
+
+        if isinstance(statement, PreparedStatement):
+            statement = statement._executed(None)
+        unwound = cypher.unwind(statement, 'rows')
+        pending = self._pending
+        self._pending = []
+
+        for batch in _batches(seq_of_parameters, batch_size, max_batch_bytes):
+            if unwound is not None:
+                pending.append((unwound, {'rows': [dict((ustr(k), v) for k, v in p.items()) for p in batch]}))
+            else:
+                pending.extend((statement, p) for p in batch)
+            self._execute(self, pending)
+            pending = []
+
+        self._pending = pending
+        self._rows = []
+        self._rowcount = -1
+        self._description = None
+        self._cursor = 0
+        return self
+
     def fetchone(self):
         self._execute_pending()
-        row = self._rows[self._cursor]
-        self._cursor += 1
-        return self._map_row(row['rest'])
+        started = time.time() if self.connection.observers else None
+        if self._result is not None:
+            row = self._map_row(self._next_streamed_row())
+        else:
+            row = self._rows[self._cursor]
+            self._cursor += 1
+            row = self._map_row(row)
+        if started is not None:
+            self._observe_rows(1, started)
+        return row
 
     def fetchmany(self, size=None):
         self._execute_pending()
+        started = time.time() if self.connection.observers else None
         if size is None:
             size = self.arraysize
-        result = [self._map_row(r['rest']) for r in self._rows[self._cursor:self._cursor + size]]
-        self._cursor += size
+        if self._result is not None:
+            result = self._fetch_streamed(size)
+        else:
+            result = [self._map_row(r) for r in self._rows[self._cursor:self._cursor + size]]
+            self._cursor += size
+        if started is not None:
+            self._observe_rows(len(result), started)
         return result
 
     def fetchall(self):
         self._execute_pending()
-        result = [self._map_row(r['rest']) for r in self._rows[self._cursor:]]
-        self._cursor += self.rowcount
+        started = time.time() if self.connection.observers else None
+        if self._result is not None:
+            result = self._fetch_streamed(None)
+        else:
+            result = [self._map_row(r) for r in self._rows[self._cursor:]]
+            self._cursor += self.rowcount
+        if started is not None:
+            self._observe_rows(len(result), started)
         return result
 
+    def fetch_columns(self):
+        """
+        Fetches the remaining rows of the current result set column by column, without building a tuple per row.
+        Returns an OrderedDict of column name to list of values, in the order of description.
+        """
+        self._execute_pending()
+        names = [d[0] for d in self._description]
+        rows = self._fetch_raw()
+        if self._result_format == 'graph':
+            columns = [list(c) for c in zip(*[self._map_row(r) for r in rows])]
+        else:
+            columns = [self._map_column(c) for c in zip(*[self._row_values(r) for r in rows])]
+        if len(columns) == 0:
+            columns = [[] for _ in names]
+        return OrderedDict(zip(names, columns))
+
+    def fetch_numpy(self):
+        """
+        Like fetch_columns, but returns a NumPy array per column. Columns of only booleans, only integers, or of
+        integers and floats get bool, int64 or float64 arrays, anything else an object array. Requires numpy.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise self.connection.NotSupportedError("fetch_numpy requires numpy to be installed.")
+        return OrderedDict((name, _to_array(numpy, values)) for name, values in self.fetch_columns().items())
+
     def __iter__(self):
         self._execute_pending()
         return self
@@ -68,6 +182,9 @@ class Cursor(object):
         self._execute_pending()
         if value < 0:
             raise self.connection.NotSupportedError()
+        if self._result is not None:
+            self._scroll_streamed(value if mode == 'relative' else value - self._cursor)
+            return
         if mode == 'relative':
             self._cursor += value
         elif mode == 'absolute':
@@ -92,8 +209,29 @@ class Cursor(object):
         self._execute_pending()
         return self._messages
 
+    @property
+    def graph(self):
+        """
+        The distinct nodes and relationships mapped so far, as a (nodes, relationships) tuple of lists, for cursors
+        with an identity map. Covers the current result set or, for the 'transaction' scope, the transaction.
+        """
+        if self._identities is None:
+            return None
+        return list(self._identities.nodes.values()), list(self._identities.relationships.values())
+
     def nextset(self):
-        pass
+        """
+        Moves on to the result set of the next statement in the batch, discarding any rows left in the
+        current one. Returns True, or None if there are no more result sets. Only batch cursors keep more
+        than one result set, other cursors keep just the result of the last statement executed.
+        """
+        self._execute_pending()
+        if self._response is not None:
+            return True if self._next_streamed_set() else None
+        if len(self._sets) == 0:
+            return None
+        self._load_set(self._sets.pop(0))
+        return True
 
     def setinputsizes(self, sizes):
         pass
@@ -102,11 +240,13 @@ class Cursor(object):
         pass
 
     def close(self):
+        self._discard_stream()
+        self._sets = []
         self._rows = None
         self._rowcount = -1
         self._messages = []
         self._description = None
-        self.connection._cursors.discard(self)
+        self.connection._forget_cursor(self)
 
     def __del__(self):
         self.close()
@@ -118,7 +258,67 @@ class Cursor(object):
         return self._id == other._id
 
     def _map_row(self, row):
-        return tuple(self._map_value(row))
+        if self._result_format != 'rest':
+            return self._map_row_format(row)
+        values = row['rest']
+        if self._mapper is None or len(values) != self._mapper.width:
+            # Rows of a result set share their shape, so the mapper is compiled from the first one
+            self._mapper = _RowMapper(values, self)
+        return self._mapper(values)
+
+    def _observe_rows(self, count, started):
+        seconds = time.time() - started
+        for observer in self.connection.observers:
+            observer.rows_fetched(self, count, seconds)
+
+    def _node(self, node_id, labels, properties):
+        if self._identities is None:
+            return neo4j.Node(node_id, labels, properties)
+        return self._identities.node(node_id, labels, properties)
+
+    def _relationship(self, rel_id, rel_type, start_id, end_id, properties):
+        if self._identities is None:
+            return neo4j.Relationship(rel_id, rel_type, start_id, end_id, properties)
+        return self._identities.relationship(rel_id, rel_type, start_id, end_id, properties)
+
+    def _reset_identities(self):
+        if self._identity_map == 'transaction' and not self._autocommit:
+            self._identities = self.connection._transaction_identities()
+        elif self._identity_map is not None:
+            self._identities = IdentityMap()
+
+    def _map_row_format(self, row):
+        if self._result_format == 'row':
+            return tuple(row['row'])
+        graph = row['graph']
+        return ([self._node(ustr(n['id']), n['labels'], n['properties']) for n in graph['nodes']],
+                [self._relationship(ustr(r['id']), r['type'], ustr(r['startNode']), ustr(r['endNode']), r['properties'])
+                 for r in graph['relationships']])
+
+    def _row_values(self, row):
+        return row['row'] if self._result_format == 'row' else row['rest']
+
+    def _map_column(self, values):
+        if self._result_format == 'row':
+            return list(values)
+        for value in values:
+            if type(value) not in _SCALARS:
+                return [v if type(v) in _SCALARS else self._map_value(v) for v in values]
+        return list(values)
+
+    def _fetch_raw(self):
+        """ Takes the remaining raw rows of the current result set. """
+        if self._result is not None:
+            rows = []
+            while self._result is not None:
+                try:
+                    rows.append(self._next_streamed_row())
+                except IndexError:
+                    break
+            return rows
+        rows = self._rows[self._cursor:]
+        self._cursor = len(self._rows)
+        return rows
 
     def _map_value(self, value):
         ''' Maps a raw deserialized row to proper types '''
@@ -135,9 +335,9 @@ class Cursor(object):
                 out.append(self._map_value( c ))
             return out
         elif isinstance(value, dict) and 'metadata' in value and 'labels' in value['metadata'] and 'self' in value:
-            return neo4j.Node(ustr(value['metadata']['id']), value['metadata']['labels'], value['data'])
+            return self._node(ustr(value['metadata']['id']), value['metadata']['labels'], value['data'])
         elif isinstance(value, dict) and 'metadata' in value and 'type' in value and 'self' in value:
-            return neo4j.Relationship(ustr(value['metadata']['id']), value['type'], value['start'].split('/')[-1], value['end'].split('/')[-1], value['data'])
+            return self._relationship(ustr(value['metadata']['id']), value['type'], value['start'].split('/')[-1], value['end'].split('/')[-1], value['data'])
         elif isinstance(value, dict):
             out = {}
             for k,v in value.items():
@@ -159,9 +359,302 @@ class Cursor(object):
             self._rowcount = 0
             self._description = []
 
-            result = self._execute(self, pending)
+            if self._read_only:
+                # Reads outside of a transaction need not open one
+                self._autocommit = not self.connection._in_transaction() and \
+                    not any(cypher.writes(statement) for statement, _ in pending)
+
+            if self._execute_stream is not None:
+                self._start_stream(pending)
+                return
+
+            if self._cached and len(pending) == 1:
+                results = self._execute_cached(pending)
+            else:
+                results = self._execute(self, pending)
+            self._load_results(results)
+
+    def _load_results(self, results):
+        if not self._batch:
+            results = results[-1:]
+        self._sets = results[1:]
+        self._load_set(results[0] if len(results) > 0 else None)
+
+    def _execute_cached(self, pending):
+        """ Executes a single statement through the result cache of the connection, if it may be cached. """
+        cache = self.connection.result_cache
+        statement, parameters = pending[0]
+        if cache is None or self._state.writes != frozenset() or cypher.writes(statement):
+            # Results read after the transaction wrote something may not have been committed
+            return self._execute(self, pending)
+
+        key = cache.key(statement, parameters) + (self._result_format,)
+        result = cache.get(key)
+        if result is not None:
+            return [{'columns': result[0], 'data': result[1]}]
+
+        generation = cache.generation
+        results = self._execute(self, pending)
+        if len(results) > 0:
+            data = results[-1]['data']
+            cache.put(key, cypher.labels(statement), results[-1]['columns'], data,
+                      len(json.dumps(data, default=repr)), generation)
+        return results
+
+    def _load_set(self, result):
+        self._mapper = None
+        self._reset_identities()
+        self._rows = result['data'] if result is not None else []
+        self._rowcount = len(self._rows)
+        self._description = self._describe(result['columns']) if result is not None else []
+        self._cursor = 0
+
+    def _describe(self, columns):
+        if self._result_format == 'graph':
+            columns = ['nodes', 'relationships']
+        return [(name, neo4j.MIXED, None, None, None, None, True) for name in columns]
+
+    #
+    # Streaming mode, rows are pulled off the response one at a time and are never all held in memory.
+    #
 
-            self._rows = result['data']
-            self._rowcount = len(self._rows)
-            self._description = [(name, neo4j.MIXED, None, None, None, None, True) for name in result['columns']]
-            self._cursor = 0
+    def _start_stream(self, pending):
+        self._response = self._execute_stream(self, pending)
+        self._stream_sets = iter(self._response)
+        self._stream_remaining = len(pending)
+
+        if not self._batch:
+            # Skip to the result of the last statement, there is one result per statement unless an error occurred
+            for _ in range(len(pending) - 1):
+                if next(self._stream_sets, None) is None:
+                    break
+                self._stream_remaining -= 1
+
+        self._next_streamed_set()
+
+    def _next_streamed_set(self):
+        self._mapper = None
+        self._reset_identities()
+        self._cursor = 0
+        self._result = None
+        self._rows = []
+        self._rowcount = 0
+        self._description = []
+
+        result = next(self._stream_sets, None) if self._stream_remaining > 0 else None
+        if result is None:
+            self._end_stream()  # Raises the error that cut the results short, if the error handler allows it
+            return False
+
+        self._stream_remaining -= 1
+        self._result = result
+        self._rows = None
+        self._rowcount = -1
+        self._description = self._describe(result.columns)
+        return True
+
+    def _next_streamed_row(self):
+        try:
+            row = next(self._result)
+        except StopIteration:
+            self._rowcount = self._cursor
+            self._result = None
+            self._rows = []
+            if self._stream_remaining == 0:
+                self._end_stream()
+            raise IndexError()
+        self._cursor += 1
+        return row
+
+    def _fetch_streamed(self, size):
+        result = []
+        while (size is None or len(result) < size) and self._result is not None:
+            try:
+                result.append(self._map_row(self._next_streamed_row()))
+            except IndexError:
+                break
+        return result
+
+    def _scroll_streamed(self, count):
+        if count < 0:
+            raise self.connection.NotSupportedError("Streaming cursors can only scroll forward.")
+        for _ in range(count):
+            self._next_streamed_row()
+
+    def _end_stream(self):
+        response = self._response
+        self._response = None
+        self._stream_sets = None
+        self._stream_remaining = 0
+        if self._result is not None:
+            self._rowcount = self._cursor
+            self._rows = []
+            self._result = None
+        response.finish()
+
+    def _discard_stream(self):
+        if self._response is not None:
+            try:
+                self._end_stream()
+            except self.connection.Error:
+                pass
+
+
+class IdentityMap(object):
+    """
+    Makes each node and relationship, keyed by id, map to a single object. Elements seen again are not built again,
+    so results that repeat elements, like paths or neighbourhoods, hold one copy of each.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.relationships = {}
+
+    def node(self, node_id, labels, properties):
+        node = self.nodes.get(node_id)
+        if node is None:
+            node = self.nodes[node_id] = neo4j.Node(node_id, labels, properties)
+        return node
+
+    def relationship(self, rel_id, rel_type, start_id, end_id, properties):
+        rel = self.relationships.get(rel_id)
+        if rel is None:
+            rel = self.relationships[rel_id] = neo4j.Relationship(rel_id, rel_type, start_id, end_id, properties)
+        return rel
+
+    def add(self, element):
+        """ Returns the object already mapped for an element with the same id, or keeps and returns element. """
+        elements = self.nodes if isinstance(element, neo4j.Node) else self.relationships
+        return elements.setdefault(element.id, element)
+
+
+class _RowMapper(object):
+    """
+    Maps the raw rows of one result set. The shape of each column (scalar, node, relationship, list or map of
+    scalars) is inferred from a sample row. Scalar columns are passed through after a type check, the others get
+    a mapping function specialised for their shape. Any value that does not fit goes to the generic map_value.
+    """
+
+    def __init__(self, sample, cursor):
+        self.width = len(sample)
+        self._map_value = cursor._map_value
+        columns = [_column_mapper(value, cursor) for value in sample]
+        self._scalars = [i for i, column in enumerate(columns) if column is None]
+        self._columns = [(i, column) for i, column in enumerate(columns) if column is not None]
+
+    def __call__(self, values):
+        out = list(values)
+        for i in self._scalars:
+            if type(out[i]) not in _SCALARS:
+                out[i] = self._map_value(out[i])
+        for i, column in self._columns:
+            out[i] = column(out[i])
+        return tuple(out)
+
+
+def _column_mapper(value, cursor):
+    """ Returns a function mapping values shaped like value, or None if value is a scalar. """
+    map_value = cursor._map_value
+    kind = type(value)
+    if kind in _SCALARS:
+        return None
+    if kind is list:
+        if all(type(v) in _SCALARS for v in value):
+            return _scalar_list_mapper(map_value)
+        return map_value
+    if kind is dict:
+        if 'self' in value and 'metadata' in value:
+            if 'labels' in value['metadata']:
+                return _node_mapper(cursor._node, map_value)
+            if 'type' in value:
+                return _relationship_mapper(cursor._relationship, map_value)
+        elif all(type(v) in _SCALARS for v in value.values()):
+            return _scalar_map_mapper(map_value)
+    return map_value
+
+
+def _scalar_list_mapper(map_value):
+    def map_list(value):
+        if type(value) is list:
+            for v in value:
+                if type(v) not in _SCALARS:
+                    return map_value(value)
+            return value
+        return map_value(value)
+    return map_list
+
+
+def _scalar_map_mapper(map_value):
+    def map_map(value):
+        if type(value) is dict and 'self' not in value:
+            for v in value.values():
+                if type(v) not in _SCALARS:
+                    return map_value(value)
+            return value
+        return map_value(value)
+    return map_map
+
+
+def _node_mapper(node, map_value):
+    def map_node(value):
+        try:
+            if 'self' in value:
+                metadata = value['metadata']
+                return node(ustr(metadata['id']), metadata['labels'], value['data'])
+        except (TypeError, KeyError):
+            pass
+        return map_value(value)
+    return map_node
+
+
+def _relationship_mapper(relationship, map_value):
+    def map_relationship(value):
+        try:
+            if 'self' in value:
+                return relationship(ustr(value['metadata']['id']), value['type'],
+                                    value['start'].rsplit('/', 1)[-1], value['end'].rsplit('/', 1)[-1], value['data'])
+        except (TypeError, KeyError, AttributeError):
+            pass
+        return map_value(value)
+    return map_relationship
+
+
+def _to_array(numpy, values):
+    kinds = frozenset(type(v) for v in values)
+    if kinds == frozenset([bool]):
+        dtype = bool
+    elif kinds and kinds <= _INTEGERS:
+        dtype = numpy.int64
+    elif float in kinds and kinds <= _INTEGERS | frozenset([float]):
+        dtype = numpy.float64
+    else:
+        dtype = object
+    if dtype is not object:
+        try:
+            return numpy.array(values, dtype=dtype)
+        except OverflowError:
+            pass  # Integers beyond 64 bits
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _batches(seq_of_parameters, batch_size, max_batch_bytes):
+    """ Groups parameter sets, turned into dicts the way execute does, into lists bounded by count and size. """
+    batch = []
+    batch_bytes = 0
+    for parameters in seq_of_parameters:
+        if not isinstance(parameters, dict):
+            parameters = dict(enumerate(parameters))
+        if max_batch_bytes is not None:
+            size = len(json.dumps(parameters))
+            if batch and batch_bytes + size > max_batch_bytes:
+                yield batch
+                batch, batch_bytes = [], 0
+            batch_bytes += size
+        batch.append(parameters)
+        if len(batch) >= batch_size:
+            yield batch
+            batch, batch_bytes = [], 0
+    if batch:
+        yield batch
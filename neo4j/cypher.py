@@ -0,0 +1,188 @@
+"""
+Helpers that look at, and rewrite, the text of Cypher statements.
+
+These work on a token level only: string literals, quoted identifiers and comments are recognised so that
+nothing inside them is touched, but there is no real parser behind them. Rewrites are only done when a statement
+is simple enough for them to be safe, otherwise None is returned and the caller should use the statement as is.
+"""
+import re
+
+# Tokens that may contain text looking like parameters or keywords
+_STRING = r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\""
+_QUOTED_IDENTIFIER = r"`[^`]*`"
+_COMMENT = r"//[^\n]*|/\*.*?\*/"
+
+_TOKENS = re.compile(r"(?P<skip>%s|%s|%s)|(?P<param>\{\s*(?P<name>\w+)\s*\})|(?P<word>[A-Za-z_]\w*)"
+                     % (_STRING, _QUOTED_IDENTIFIER, _COMMENT), re.DOTALL)
+
+_NORMALIZE = re.compile(r"(?P<keep>%s|%s)|(?P<comment>%s)|(?P<space>\s+)" % (_STRING, _QUOTED_IDENTIFIER, _COMMENT),
+                        re.DOTALL)
+
+_LITERALS = re.compile(r"(?P<string>%s)|(?P<skip>%s|%s|\{\s*\w+\s*\})|(?P<number>(?<![\w.])\d+(?:\.\d+)?(?:[eE][-+]?\d+)?(?!\w))"
+                       % (_STRING, _QUOTED_IDENTIFIER, _COMMENT), re.DOTALL)
+
+# Clauses after which an UNWIND prefix would change what the statement means, or is not allowed
+_NOT_UNWINDABLE = frozenset(['WITH', 'RETURN', 'UNION', 'PERIODIC', 'LIMIT', 'SKIP', 'ORDER', 'START'])
+
+# Clauses that change the graph, or otherwise must not run once per page
+_NOT_PAGEABLE = frozenset(['CREATE', 'MERGE', 'SET', 'DELETE', 'REMOVE', 'FOREACH', 'LOAD', 'UNION', 'CALL',
+                           'SKIP', 'LIMIT', 'EXPLAIN', 'PROFILE'])
+
+# Clauses that write to the graph, or may do so
+_WRITING = frozenset(['CREATE', 'MERGE', 'SET', 'DELETE', 'REMOVE', 'DETACH', 'FOREACH', 'LOAD', 'CALL'])
+
+# Keywords a parenthesis may follow and open a pattern rather than a function call
+_PATTERN_KEYWORDS = frozenset(['MATCH', 'MERGE', 'CREATE', 'WHERE', 'AND', 'OR', 'XOR', 'NOT', 'RETURN', 'WITH',
+                               'DISTINCT', 'IN', 'UNWIND', 'DELETE', 'SET', 'REMOVE', 'WHEN', 'THEN', 'ELSE', 'BY',
+                               'AS', 'UNIQUE'])
+
+# Keywords a parameter may follow and still be an ordinary expression
+_EXPRESSION_KEYWORDS = frozenset(['IN', 'AND', 'OR', 'XOR', 'NOT', 'WHERE', 'WHEN', 'THEN', 'ELSE', 'CONTAINS'])
+
+
+def tokens(statement):
+    """ Yields (kind, text, match) for parameters and words outside of strings, quoted identifiers and comments. """
+    for match in _TOKENS.finditer(statement):
+        if match.group('param') is not None:
+            yield 'param', match.group('name'), match
+        elif match.group('word') is not None:
+            yield 'word', match.group('word'), match
+
+
+def normalize(statement):
+    """ Collapses whitespace and drops comments, outside of strings and quoted identifiers. """
+    def replace(match):
+        return match.group('keep') or ' '
+    # Twice, as dropping a comment can leave whitespace on both sides of it
+    return _NORMALIZE.sub(replace, _NORMALIZE.sub(replace, statement)).strip().rstrip(';').rstrip()
+
+
+def literals(statement):
+    """
+    Returns the string and number literals in a statement that look like values, which could have been parameters
+    instead. Numbers after SKIP or LIMIT, in variable length patterns and used as list indexes are not included.
+    """
+    out = []
+    for match in _LITERALS.finditer(statement):
+        if match.group('string') is not None:
+            out.append(match.group('string'))
+        elif match.group('number') is not None:
+            before = statement[:match.start()].rstrip()
+            after = statement[match.end():].lstrip()
+            if before.endswith('*') or before.endswith('..') or after.startswith('..') or \
+                    (before.endswith('[') and after.startswith(']')) or re.search(r"(?i)\b(SKIP|LIMIT)$", before):
+                continue
+            out.append(match.group('number'))
+    return out
+
+
+def unwind(statement, rows_parameter='rows'):
+    """
+    Rewrites a statement that is run once per parameter set into one that is run once for a list of parameter
+    sets, passed as rows_parameter:
+
+        CREATE (n:User {name:{name}})  ->  UNWIND {rows} AS row CREATE (n:User {name:row.name})
+
+    Returns None if the statement cannot safely be rewritten, for instance when it aggregates, returns rows, uses
+    a parameter as a properties map in a pattern or uses a parameter for SKIP or LIMIT.
+    """
+    words = set()
+    replacements = []
+    for kind, text, match in tokens(statement):
+        if kind == 'word':
+            words.add(text.upper())
+            if text.upper() in _NOT_UNWINDABLE and not _is_name(statement, match):
+                return None
+        else:
+            preceding = statement[:match.start()].rstrip()
+            if preceding and (preceding[-1] in ')]`' or preceding[-1].isalnum() or preceding[-1] == '_'):
+                previous_word = re.search(r"(\w+)$", preceding)
+                if previous_word is None or previous_word.group(1).upper() not in _EXPRESSION_KEYWORDS:
+                    return None
+            replacements.append((match.start(), match.end(), text))
+
+    row = 'row'
+    while row.upper() in words:
+        row += '_'
+
+    out = []
+    position = 0
+    for start, end, name in replacements:
+        out.append(statement[position:start])
+        out.append('%s.%s' % (row, name) if not name[0].isdigit() else '%s.`%s`' % (row, name))
+        position = end
+    out.append(statement[position:])
+    return 'UNWIND {%s} AS %s %s' % (rows_parameter, row, ''.join(out).strip())
+
+
+def paginate(statement, skip_parameter='skip', limit_parameter='limit'):
+    """
+    Rewrites a read-only statement to return a single page of its rows, from skip_parameter and at most
+    limit_parameter of them:
+
+        MATCH (n) RETURN n ORDER BY n.name  ->  MATCH (n) RETURN n ORDER BY n.name SKIP {skip} LIMIT {limit}
+
+    Returns None if the statement cannot be paged this way: if it writes to the graph, does not end in RETURN, or
+    already has its own SKIP or LIMIT. Pages are only consistent with each other if the statement orders its rows
+    and they are read in the same transaction.
+    """
+    returns = False
+    for kind, text, match in tokens(statement):
+        if kind == 'word' and not _is_name(statement, match):
+            word = text.upper()
+            if word in _NOT_PAGEABLE:
+                return None
+            if word in ('RETURN', 'WITH', 'UNWIND', 'MATCH', 'START'):
+                returns = word == 'RETURN'
+    if not returns:
+        return None
+    return '%s SKIP {%s} LIMIT {%s}' % (statement.strip().rstrip(';').rstrip(), skip_parameter, limit_parameter)
+
+
+def writes(statement):
+    """ True if a statement may write to the graph. """
+    for kind, text, match in tokens(statement):
+        if kind == 'word' and text.upper() in _WRITING and not _is_name(statement, match):
+            return True
+    return False
+
+
+def labels(statement):
+    """
+    Returns the labels and relationship types a statement mentions, or None if it has a node pattern without a
+    label, which could match nodes of any label. Errs on the side of None, so the result can be trusted to cover
+    every label the statement can match.
+    """
+    found = set()
+    blanked = _blank(statement)
+    if re.search(r"\bSTART\b", blanked, flags=re.IGNORECASE):
+        return None  # Legacy index lookups name no label
+    for match in re.finditer(r"[:(]", blanked):
+        before = blanked[:match.start()].rstrip()
+        after = blanked[match.end():]
+        if match.group() == ':':
+            name = re.match(r"\s*(\w+|`[^`]*`)", after)
+            if name is not None and not after[name.end():].lstrip().startswith(('.', '(')):
+                found.add(name.group(1).strip('`'))
+        else:
+            previous_word = re.search(r"(\w+)$", before)
+            if previous_word is not None and previous_word.group(1).upper() not in _PATTERN_KEYWORDS:
+                continue  # A function call
+            if re.match(r"\s*\w*\s*:", after) is None:
+                return None
+    return frozenset(found)
+
+
+def _blank(statement):
+    """ Replaces strings and comments with spaces, keeping quoted identifiers. """
+    def replace(match):
+        text = match.group()
+        return text if text.startswith('`') else ' ' * len(text)
+    return re.sub(r"%s|%s|%s" % (_STRING, _QUOTED_IDENTIFIER, _COMMENT), replace, statement, flags=re.DOTALL)
+
+
+def _is_name(statement, match):
+    """ True if a word is a label, relationship type, property key or map key rather than a keyword. """
+    before = statement[:match.start()].rstrip()
+    after = statement[match.end():].lstrip()
+    return (before.endswith('.') or before.endswith(':')) or after.startswith(':')
@@ -0,0 +1,188 @@
+"""
+Instrumentation hooks.
+
+Observers appended to connection.observers are told about every http request the connection makes, broken down
+into phases, about rows handed out by cursors and about transactions beginning and ending. Observers are called
+on the thread doing the work and should be quick; nothing is measured while a connection has no observers.
+
+StatsObserver is a ready-made observer that keeps counters and histograms in memory:
+
+    stats = StatsObserver()
+    connection.observers.append(stats)
+    ...
+    print(stats.report())
+"""
+import bisect
+import threading
+import time
+
+# Request phases: building and compressing the body, sending it and waiting for the response headers, and reading
+# and decoding the body. For streaming cursors, reading lasts until the last row has been fetched.
+PHASES = ('encode', 'wait', 'read')
+
+
+class Observer(object):
+
+    """ Base class of observers, with a method per event that does nothing. """
+
+    def request_started(self, method, path):
+        pass
+
+    def request_finished(self, method, path, status, timings, bytes_sent, bytes_received):
+        """
+        timings maps each of PHASES, and 'total', to seconds. Bytes are those of the request and response bodies as
+        they went over the wire, so after compression.
+        """
+        pass
+
+    def request_retried(self, method, path, error):
+        pass
+
+    def rows_fetched(self, cursor, count, seconds):
+        """
+        A fetch call handed out count rows, taking seconds to map them to python values, and for streaming cursors
+        to read and decode them.
+        """
+        pass
+
+    def transaction(self, event):
+        """ The transaction of the calling thread saw event: 'begin', 'commit' or 'rollback'. """
+        pass
+
+
+class Histogram(object):
+
+    """ Counts values into buckets whose bounds grow by a factor of two, from lowest up. """
+
+    def __init__(self, lowest=1e-6, buckets=40):
+        self.bounds = [lowest * 2 ** i for i in range(buckets)]
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self):
+        return self.total / float(self.count) if self.count else None
+
+    def percentile(self, p):
+        """ Upper bound of the bucket holding the p-th percentile, p from 0 to 100. """
+        if not self.count:
+            return None
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+
+class StatsObserver(Observer):
+
+    """
+    Counts requests, retries, bytes, rows and transaction events, and keeps a Histogram of seconds per request
+    phase in timings, and of seconds per fetch call in timings['rows'].
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.rows = 0
+        self.transactions = {}  # Event -> count
+        self.timings = dict((phase, Histogram()) for phase in PHASES + ('total', 'rows'))
+        self._lock = threading.Lock()
+
+    def request_finished(self, method, path, status, timings, bytes_sent, bytes_received):
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+            for phase, seconds in timings.items():
+                self.timings[phase].add(seconds)
+
+    def request_retried(self, method, path, error):
+        with self._lock:
+            self.retries += 1
+
+    def rows_fetched(self, cursor, count, seconds):
+        with self._lock:
+            self.rows += count
+            self.timings['rows'].add(seconds)
+
+    def transaction(self, event):
+        with self._lock:
+            self.transactions[event] = self.transactions.get(event, 0) + 1
+
+    def report(self):
+        """ A summary of the counters and timings, in milliseconds, as text. """
+        lines = ['requests: %d, retries: %d, bytes sent: %d, bytes received: %d, rows: %d' %
+                 (self.requests, self.retries, self.bytes_sent, self.bytes_received, self.rows)]
+        if self.transactions:
+            lines.append('transactions: ' + ', '.join('%s %d' % item for item in sorted(self.transactions.items())))
+        for phase in PHASES + ('total', 'rows'):
+            histogram = self.timings[phase]
+            if histogram.count:
+                lines.append('%-6s n=%d mean=%.3fms p50=%.3fms p99=%.3fms max=%.3fms' % (
+                    phase, histogram.count, histogram.mean * 1000, histogram.percentile(50) * 1000,
+                    histogram.percentile(99) * 1000, histogram.max * 1000))
+        return '\n'.join(lines)
+
+
+class _Probe(object):
+
+    """ Times one http request through its phases and reports it to the observers once its body has been read. """
+
+    def __init__(self, observers, method, path):
+        self.method = method
+        self.path = path
+        self.status = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.timings = {}
+        self._observers = observers
+        self._started = self._last = time.time()
+        self._finished = False
+        for observer in observers:
+            observer.request_started(method, path)
+
+    def mark(self, phase):
+        now = time.time()
+        self.timings[phase] = self.timings.get(phase, 0) + now - self._last
+        self._last = now
+
+    def finish(self):
+        if self._finished:
+            return
+        self._finished = True
+        self.mark('read')
+        self.timings['total'] = self._last - self._started
+        for observer in self._observers:
+            observer.request_finished(self.method, self.path, self.status, self.timings, self.bytes_sent,
+                                      self.bytes_received)
+
+
+class _CountingReader(object):
+
+    """ Wraps the body of a response, counting the bytes read off it and finishing its probe at the end. """
+
+    def __init__(self, fp, probe):
+        self._fp = fp
+        self._probe = probe
+
+    def read(self, size=-1):
+        data = self._fp.read() if size is None or size < 0 else self._fp.read(size)
+        self._probe.bytes_received += len(data)
+        if not data or size is None or size < 0:
+            self._probe.finish()
+        return data
@@ -0,0 +1,80 @@
+"""
+JSON codecs, turning request bodies into bytes and response bodies back into python values.
+
+Connections use the fastest codec installed, in the order of CODECS: orjson, then ujson, then the json module of
+the standard library. Codecs encode straight to bytes and decode straight from bytes, without an intermediate str
+where the library allows it. Values an accelerated library cannot encode, such as integers beyond 64 bits, are
+encoded by the standard library instead, so every codec accepts the same parameters.
+
+Rows of streaming cursors are decoded as they arrive by neo4j.jsonstream, which always uses the standard library.
+"""
+import json
+import sys
+
+CODECS = ('orjson', 'ujson', 'json')
+
+
+class JsonCodec(object):
+
+    name = 'json'
+
+    def dumps(self, value):
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data):
+        if sys.version_info < (3, 6) and isinstance(data, bytes) and not isinstance(data, str):
+            data = data.decode('utf-8')  # json.loads takes bytes from python 3.6
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS  # Positional parameters are keyed by index
+
+    def dumps(self, value):
+        try:
+            return self._orjson.dumps(value, option=self._options)
+        except TypeError:
+            return JsonCodec.dumps(self, value)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, value):
+        try:
+            return self._ujson.dumps(value).encode('utf-8')
+        except (TypeError, OverflowError):
+            return JsonCodec.dumps(self, value)
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+
+_CLASSES = {'orjson': OrjsonCodec, 'ujson': UjsonCodec, 'json': JsonCodec}
+
+
+def get(name=None):
+    """ Returns the codec called name, or the first of CODECS that is installed. Raises ImportError. """
+    if name is not None:
+        if name not in _CLASSES:
+            raise ImportError("Unknown JSON codec: %s" % name)
+        return _CLASSES[name]()
+    for name in CODECS:
+        try:
+            return _CLASSES[name]()
+        except ImportError:
+            pass
@@ -0,0 +1,263 @@
+"""
+Incremental decoding of transactional endpoint responses.
+
+The transactional endpoint answers with documents shaped like:
+
+    {"commit": "...",
+     "results": [{"columns": [...], "data": [{...}, {...}, ...]}, ...],
+     "transaction": {...},
+     "errors": [...]}
+
+TransactionResponse walks such a document straight off a file-like object (normally the http response) and hands
+out the rows in results[].data[] one at a time, as soon as they have arrived. Only a small read buffer plus the row
+currently being decoded is held in memory, rather than the raw body, the decoded body and the parsed tree at once.
+"""
+import codecs
+import io
+import json
+
+DEFAULT_CHUNK_SIZE = 8192
+
+_WHITESPACE = ' \t\n\r'
+
+
+class ResultStream(object):
+    """ One entry in results[], iterating over its rows as they are decoded. """
+
+    def __init__(self, response, fields):
+        self.fields = fields
+        self._response = response
+        self._done = False
+
+    @property
+    def columns(self):
+        return self.fields.get('columns', [])
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._done:
+            raise StopIteration()
+        event = self._response._next_event()
+        if event is not None and event[0] == 'row':
+            return event[1]
+        self._done = True
+        raise StopIteration()
+
+    def next(self):
+        return self.__next__()
+
+    def _drain(self):
+        for _ in self:
+            pass
+
+
+class TransactionResponse(object):
+    """
+    Iterating over a TransactionResponse yields a ResultStream for each entry in results[]. Moving on to the next
+    result discards any rows left unread in the previous one. All other top level members, like errors, end up in
+    the fields dict once they have been read; call finish() to make sure the whole document has been consumed.
+
+    on_complete, if given, is called with this response once the end of the document has been reached.
+
+    With a codec, see neo4j.jsoncodec, read_all() on a response nothing has been read from yet decodes the whole
+    body in one go, which is much faster than decoding it incrementally.
+    """
+
+    _codec = None
+
+    def __init__(self, fp, chunk_size=DEFAULT_CHUNK_SIZE, on_complete=None, codec=None):
+        self.fields = {}
+        self.complete = False
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._on_complete = on_complete
+        self._codec = codec
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._events = self._parse()
+        self._current = None
+
+    @property
+    def errors(self):
+        return self.fields.get('errors', [])
+
+    def __iter__(self):
+        while True:
+            if self._current is not None:
+                self._current._drain()
+                self._current = None
+            event = self._next_event()
+            if event is None:
+                return
+            self._current = ResultStream(self, event[1])
+            yield self._current
+
+    def finish(self):
+        """ Reads the remainder of the document, discarding unread rows. """
+        for _ in self:
+            pass
+        return self
+
+    def read_all(self):
+        """ Reads the whole document, returning it the way json.loads would have. """
+        if self._codec is not None and self._buf == '' and not self._eof:
+            return self._decode_all()
+        results = []
+        for result in self:
+            data = list(result)
+            doc = dict(result.fields)
+            doc['data'] = data
+            results.append(doc)
+        doc = dict(self.fields)
+        doc['results'] = results
+        return doc
+
+    def detach(self):
+        """
+        Buffers whatever is left of the raw body in memory, so the underlying connection can be used for other
+        requests while this response is still being read.
+        """
+        if not self._eof and not isinstance(self._fp, io.BytesIO):
+            self._fp = io.BytesIO(self._fp.read())
+
+    def _next_event(self):
+        return next(self._events, None)
+
+    def _decode_all(self):
+        doc = self._codec.loads(self._fp.read())
+        self._eof = True
+        self._events = iter(())
+        self.fields = dict((key, value) for key, value in doc.items() if key != 'results')
+        self.complete = True
+        if self._on_complete is not None:
+            self._on_complete(self)
+        return doc
+
+    #
+    # Parsing
+    #
+
+    def _parse(self):
+        self._expect('{')
+        for key in self._members():
+            if key == 'results':
+                self._expect('[')
+                for _ in self._elements():
+                    for event in self._parse_result():
+                        yield event
+            else:
+                self.fields[key] = self._value()
+        self._skip_whitespace()
+        if self._pos < len(self._buf):
+            raise self._error("Extra data")
+        self.complete = True
+        if self._on_complete is not None:
+            self._on_complete(self)
+
+    def _parse_result(self):
+        fields = {}
+        started = False
+        self._expect('{')
+        for key in self._members():
+            if key == 'data':
+                started = True
+                yield ('result', fields)
+                self._expect('[')
+                for _ in self._elements():
+                    yield ('row', self._value())
+            else:
+                fields[key] = self._value()
+        if not started:
+            yield ('result', fields)
+        yield ('end', None)
+
+    def _members(self):
+        """ Yields each key of an object whose '{' has been consumed; the caller reads the value. """
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            yield key
+            c = self._next_char()
+            if c == '}':
+                return
+            if c != ',':
+                raise self._error("Expecting ',' delimiter")
+
+    def _elements(self):
+        """ Yields once per element of an array whose '[' has been consumed; the caller reads the element. """
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield
+            c = self._next_char()
+            if c == ']':
+                return
+            if c != ',':
+                raise self._error("Expecting ',' delimiter")
+
+    def _value(self):
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+            except ValueError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            if end == len(self._buf) and not self._eof:
+                # A number at the end of the buffer may continue in the next chunk
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _expect(self, c):
+        if self._next_char() != c:
+            raise self._error("Expecting '%s'" % c)
+
+    def _next_char(self):
+        c = self._peek()
+        self._pos += 1
+        return c
+
+    def _peek(self):
+        self._skip_whitespace()
+        if self._pos < len(self._buf):
+            return self._buf[self._pos]
+        return ''
+
+    def _skip_whitespace(self):
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf) or self._eof:
+                return
+            self._fill()
+
+    def _fill(self):
+        # Read at least as much as is already buffered, so that a value spanning many chunks is retried a
+        # logarithmic rather than linear number of times.
+        size = max(self._chunk_size, len(self._buf) - self._pos)
+        data = self._fp.read(size)
+        if data:
+            text = self._decoder.decode(data)
+        else:
+            text = self._decoder.decode(b'', True)
+            self._eof = True
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+
+    def _error(self, message):
+        return ValueError("%s: char %d of buffered response" % (message, self._pos))
@@ -0,0 +1,30 @@
+"""
+Keeping idle transactions open.
+
+The server rolls back a transaction that has not seen a request for a while, 60 seconds by default, and reports
+when it will do so with every response in the transaction. Connection.keep_alive() starts a KeepAlive, a background
+thread that sends an empty request in each transaction of the connection that is about to expire, which resets the
+timeout. Transactions with a request in flight are left alone, and their own requests wait for a keep-alive request
+in them to finish, as the server refuses concurrent requests in a transaction.
+"""
+import threading
+
+
+class KeepAlive(object):
+
+    def __init__(self, connection, margin, interval):
+        self.margin = margin
+        self._connection = connection
+        self._interval = interval
+        self._stopped = threading.Event()
+        thread = threading.Thread(target=self._run)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._connection._touch_expiring(self.margin)
+            self._stopped.wait(self._interval)
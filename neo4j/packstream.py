@@ -0,0 +1,209 @@
+"""
+PackStream, the binary serialization format of the Bolt protocol.
+
+Values map to Python types as follows: None, bool, int, float, unicode strings, bytes, lists and dicts map to
+themselves, and PackStream structures map to Structure, a signature byte plus a list of fields. When unpacking, a
+structure hook can turn structures into something else as they are read, which is how the Bolt connection gets
+its graph types.
+"""
+import struct
+
+from neo4j.strings import ustr, unicode_type
+
+try:
+    long
+    _BINARY = (bytearray,)  # Python 2, where bytes is str
+except NameError:
+    long = int  # Python 3
+    _BINARY = (bytes, bytearray)
+
+
+class Structure(object):
+
+    def __init__(self, signature, fields):
+        self.signature = signature
+        self.fields = fields
+
+    def __eq__(self, other):
+        return isinstance(other, Structure) and self.signature == other.signature and self.fields == other.fields
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return "Structure(%r, %r)" % (self.signature, self.fields)
+
+
+_INT_8 = struct.Struct('>b')
+_INT_16 = struct.Struct('>h')
+_INT_32 = struct.Struct('>i')
+_INT_64 = struct.Struct('>q')
+_UINT_8 = struct.Struct('>B')
+_UINT_16 = struct.Struct('>H')
+_UINT_32 = struct.Struct('>I')
+_FLOAT_64 = struct.Struct('>d')
+
+
+def pack(value):
+    """ Serializes a value into PackStream bytes. """
+    out = []
+    _pack(value, out.append)
+    return b''.join(out)
+
+
+def _pack(value, write):
+    if value is None:
+        write(b'\xC0')
+    elif value is True:
+        write(b'\xC3')
+    elif value is False:
+        write(b'\xC2')
+    elif isinstance(value, float):
+        write(b'\xC1' + _FLOAT_64.pack(value))
+    elif isinstance(value, (int, long)):
+        if -0x10 <= value < 0x80:
+            write(_INT_8.pack(value))
+        elif -0x80 <= value < 0x80:
+            write(b'\xC8' + _INT_8.pack(value))
+        elif -0x8000 <= value < 0x8000:
+            write(b'\xC9' + _INT_16.pack(value))
+        elif -0x80000000 <= value < 0x80000000:
+            write(b'\xCA' + _INT_32.pack(value))
+        elif -0x8000000000000000 <= value < 0x8000000000000000:
+            write(b'\xCB' + _INT_64.pack(value))
+        else:
+            raise ValueError("Integer %d is out of range" % value)
+    elif isinstance(value, _BINARY):
+        _pack_header(len(value), None, b'\xCC', b'\xCD', b'\xCE', write)
+        write(bytes(value))
+    elif isinstance(value, (str, unicode_type)):
+        encoded = ustr(value).encode('utf-8')
+        _pack_header(len(encoded), 0x80, b'\xD0', b'\xD1', b'\xD2', write)
+        write(encoded)
+    elif isinstance(value, (list, tuple)):
+        _pack_header(len(value), 0x90, b'\xD4', b'\xD5', b'\xD6', write)
+        for item in value:
+            _pack(item, write)
+    elif isinstance(value, dict):
+        _pack_header(len(value), 0xA0, b'\xD8', b'\xD9', b'\xDA', write)
+        for k, v in value.items():
+            _pack(ustr(k), write)
+            _pack(v, write)
+    elif isinstance(value, Structure):
+        size = len(value.fields)
+        if size < 0x10:
+            write(_UINT_8.pack(0xB0 + size))
+        elif size < 0x100:
+            write(b'\xDC' + _UINT_8.pack(size))
+        else:
+            write(b'\xDD' + _UINT_16.pack(size))
+        write(_UINT_8.pack(value.signature))
+        for field in value.fields:
+            _pack(field, write)
+    else:
+        raise ValueError("Values of type %s cannot be sent over Bolt" % type(value).__name__)
+
+
+def _pack_header(size, tiny, marker_8, marker_16, marker_32, write):
+    if tiny is not None and size < 0x10:
+        write(_UINT_8.pack(tiny + size))
+    elif size < 0x100:
+        write(marker_8 + _UINT_8.pack(size))
+    elif size < 0x10000:
+        write(marker_16 + _UINT_16.pack(size))
+    else:
+        write(marker_32 + _UINT_32.pack(size))
+
+
+def unpack(data, hook=Structure):
+    """ Deserializes one value from PackStream bytes, returning the value. """
+    value, _ = unpack_from(bytearray(data), 0, hook)
+    return value
+
+
+def unpack_from(data, offset, hook=Structure):
+    """
+    Deserializes the value starting at offset in a bytearray, returning (value, offset after it). Structures are
+    passed to hook(signature, fields).
+    """
+    marker = data[offset]
+    offset += 1
+
+    if marker < 0x80:
+        return marker, offset
+    if marker >= 0xF0:
+        return marker - 0x100, offset
+    high = marker & 0xF0
+    if high == 0x80:
+        return _unpack_string(data, offset, marker & 0x0F, hook)
+    if high == 0x90:
+        return _unpack_list(data, offset, marker & 0x0F, hook)
+    if high == 0xA0:
+        return _unpack_map(data, offset, marker & 0x0F, hook)
+    if high == 0xB0:
+        return _unpack_structure(data, offset, marker & 0x0F, hook)
+
+    if marker == 0xC0:
+        return None, offset
+    if marker == 0xC1:
+        return _FLOAT_64.unpack_from(data, offset)[0], offset + 8
+    if marker == 0xC2:
+        return False, offset
+    if marker == 0xC3:
+        return True, offset
+    if marker == 0xC8:
+        return _INT_8.unpack_from(data, offset)[0], offset + 1
+    if marker == 0xC9:
+        return _INT_16.unpack_from(data, offset)[0], offset + 2
+    if marker == 0xCA:
+        return _INT_32.unpack_from(data, offset)[0], offset + 4
+    if marker == 0xCB:
+        return _INT_64.unpack_from(data, offset)[0], offset + 8
+
+    sized = _SIZED.get(marker)
+    if sized is not None:
+        size_struct, unpack_sized = sized
+        size = size_struct.unpack_from(data, offset)[0]
+        return unpack_sized(data, offset + size_struct.size, size, hook)
+
+    raise ValueError("Unknown PackStream marker 0x%02X" % marker)
+
+
+def _unpack_string(data, offset, size, hook):
+    return data[offset:offset + size].decode('utf-8'), offset + size
+
+
+def _unpack_list(data, offset, size, hook):
+    out = []
+    for _ in range(size):
+        value, offset = unpack_from(data, offset, hook)
+        out.append(value)
+    return out, offset
+
+
+def _unpack_map(data, offset, size, hook):
+    out = {}
+    for _ in range(size):
+        key, offset = unpack_from(data, offset, hook)
+        out[key], offset = unpack_from(data, offset, hook)
+    return out, offset
+
+
+def _unpack_structure(data, offset, size, hook):
+    signature = data[offset]
+    fields, offset = _unpack_list(data, offset + 1, size, hook)
+    return hook(signature, fields), offset
+
+
+def _unpack_bytes(data, offset, size, hook):
+    return bytes(data[offset:offset + size]), offset + size
+
+
+# Markers followed by an explicit size: bytes, strings, lists, maps and structures
+_SIZED = {
+    0xCC: (_UINT_8, _unpack_bytes), 0xCD: (_UINT_16, _unpack_bytes), 0xCE: (_UINT_32, _unpack_bytes),
+    0xD0: (_UINT_8, _unpack_string), 0xD1: (_UINT_16, _unpack_string), 0xD2: (_UINT_32, _unpack_string),
+    0xD4: (_UINT_8, _unpack_list), 0xD5: (_UINT_16, _unpack_list), 0xD6: (_UINT_32, _unpack_list),
+    0xD8: (_UINT_8, _unpack_map), 0xD9: (_UINT_16, _unpack_map), 0xDA: (_UINT_32, _unpack_map),
+    0xDC: (_UINT_8, _unpack_structure), 0xDD: (_UINT_16, _unpack_structure),
+}
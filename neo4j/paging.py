@@ -0,0 +1,189 @@
+"""
+Paged results, for cursors created with a page_size.
+
+The last statement executed on a paged cursor is rewritten with SKIP and LIMIT parameters and run one page at a
+time, in the transaction of the cursor. As soon as a page has arrived, the next one is requested on a socket of
+its own in a background thread, so that it travels over the network while the current page is being read. Only
+one page is fetched ahead, which keeps memory use at about two pages whatever the size of the result.
+"""
+import sys
+import threading
+
+from neo4j import cypher
+
+SKIP_PARAMETER = 'page_skip'
+LIMIT_PARAMETER = 'page_limit'
+
+
+class PagedResponse(object):
+
+    """
+    Takes the place of the TransactionResponse of a streaming cursor: iterating over it yields the result of each
+    statement, as something iterating over rows with a columns attribute. All statements before the last are run
+    along with the first page of the last one.
+    """
+
+    def __init__(self, connection, cursor, statements, page_size):
+        self.fields = {'errors': []}
+        self.complete = False
+        self._connection = connection
+        self._cursor = cursor
+        self._page_size = page_size
+
+        statement, parameters = statements[-1]
+        self._statement = cypher.paginate(statement, SKIP_PARAMETER, LIMIT_PARAMETER)
+        self._parameters = parameters
+        if self._statement is not None:
+            statements = list(statements[:-1]) + [(self._statement, self._page_parameters(0))]
+
+        results = connection._execute(cursor, statements)
+        self._tx = None if cursor._autocommit else connection._tx
+        self._results = [_Result(result['columns'], result['data']) for result in results]
+        if self._statement is not None and len(results) == len(statements):
+            self._results[-1] = _PagedResult(self, results[-1]['columns'], results[-1]['data'])
+
+    @property
+    def errors(self):
+        return self.fields['errors']
+
+    def __iter__(self):
+        for result in self._results:
+            yield result
+
+    def finish(self):
+        """ Stops paging, waiting for a page still being fetched ahead. """
+        for result in self._results:
+            result.close()
+        self._results = []
+        self.complete = True
+        return self
+
+    def detach(self):
+        pass  # Pages are read off the socket whole
+
+    def _page_parameters(self, skip):
+        parameters = dict(self._parameters)
+        parameters[SKIP_PARAMETER] = skip
+        parameters[LIMIT_PARAMETER] = self._page_size
+        return parameters
+
+
+class _Result(object):
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self._rows = iter(rows)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._rows)
+
+    def next(self):
+        return self.__next__()
+
+    def close(self):
+        pass
+
+
+class _PagedResult(_Result):
+
+    def __init__(self, response, columns, rows):
+        _Result.__init__(self, columns, rows)
+        self._response = response
+        self._skip = len(rows)
+        self._more = len(rows) == response._page_size
+        self._prefetch = None
+        if self._more:
+            self._start_prefetch()
+
+    def __next__(self):
+        while True:
+            try:
+                return next(self._rows)
+            except StopIteration:
+                if not self._more:
+                    raise
+                self._next_page()
+
+    def close(self):
+        self._more = False
+        self._take_prefetch()
+
+    def _next_page(self):
+        response = self._response
+        connection, cursor = response._connection, response._cursor
+
+        prefetch = self._take_prefetch()
+        if prefetch is not None:
+            if prefetch.error is not None:
+                self._more = False
+                raise prefetch.error
+            connection._handle_errors(prefetch.result, cursor, cursor)
+            results = prefetch.result['results']
+        elif response._tx is not None and response._tx != connection._tx:
+            self._more = False
+            raise connection.InterfaceError("The transaction the result was paged in has ended.")
+        else:
+            results = connection._execute(cursor, [(response._statement, response._page_parameters(self._skip))])
+
+        rows = results[-1]['data'] if len(results) > 0 else []
+        self._rows = iter(rows)
+        self._skip += len(rows)
+        self._more = len(rows) == response._page_size
+        if self._more:
+            self._start_prefetch()
+
+    def _start_prefetch(self):
+        from neo4j.connection import TX_ENDPOINT
+
+        response = self._response
+        connection, cursor = response._connection, response._cursor
+        if not connection._prefetch_pages:
+            return
+        tx = response._tx
+        if (tx is not None and tx != connection._tx) or tx == TX_ENDPOINT:
+            return  # The transaction has ended, _next_page reports it
+
+        statements = [(response._statement, response._page_parameters(self._skip))]
+        self._prefetch = _Prefetch(connection, cursor, tx, statements)
+        if tx is not None:
+            # Requests in the same transaction have to wait until the page has arrived
+            connection._state.prefetch = self._prefetch
+
+    def _take_prefetch(self):
+        prefetch = self._prefetch
+        if prefetch is not None:
+            self._prefetch = None
+            prefetch.wait()
+            state = self._response._connection._state
+            if state.prefetch is prefetch:
+                state.prefetch = None
+        return prefetch
+
+
+class _Prefetch(object):
+
+    def __init__(self, connection, cursor, tx, statements):
+        self.result = None
+        self.error = None
+        self._done = threading.Event()
+        thread = threading.Thread(target=self._fetch, args=(connection, cursor, tx, statements))
+        thread.daemon = True
+        thread.start()
+
+    def wait(self):
+        self._done.wait()
+
+    def _fetch(self, connection, cursor, tx, statements):
+        if tx is not None:
+            connection._enter_tx(tx)
+        try:
+            self.result = connection._execute_detached(cursor, tx, statements)
+        except Exception:
+            self.error = sys.exc_info()[1]
+        finally:
+            if tx is not None:
+                connection._leave_tx(tx)
+            self._done.set()
@@ -0,0 +1,134 @@
+import sys
+import threading
+
+from neo4j.connection import Connection
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+class ParallelExecutor(object):
+
+    """
+    Runs independent transactions concurrently over one connection.
+
+    A connection runs one transaction per thread, each on a keep-alive socket of its own, so a handful of worker
+    threads sharing a connection can have that many requests in flight at once. Work is submitted without waiting
+    for earlier work to finish, and every submission gets back a PendingResult to collect its outcome from.
+
+    >>> executor = ParallelExecutor(neo4j.connect("http://localhost:7474"), size=8)
+    >>> pending = [executor.execute("MATCH (n)--(m) WHERE id(n) = {0} RETURN m", node_id) for node_id in ids]
+    >>> neighbourhoods = [p.result() for p in pending]
+    >>> executor.close()
+    """
+
+    def __init__(self, connection, size=4):
+        self.connection = connection
+        self._queue = queue.Queue()
+        self._workers = []
+        self._closed = False
+        for _ in range(size):
+            worker = threading.Thread(target=self._work)
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def execute(self, statement, *args, **kwargs):
+        """
+        Runs a single statement in a transaction of its own, opened and committed in one request. The result
+        is the list of rows it returned.
+        """
+        return self._submit(True, _fetch_all, (statement,) + args, kwargs)
+
+    def submit(self, work, *args, **kwargs):
+        """
+        Calls work(cursor, *args, **kwargs) on a worker thread, then commits the transaction it ran in. If
+        work raises, the transaction is rolled back instead. The result is whatever work returned.
+        """
+        return self._submit(False, work, args, kwargs)
+
+    def close(self, wait=True):
+        """ Stops the workers once the work submitted so far is done. """
+        if not self._closed:
+            self._closed = True
+            for _ in self._workers:
+                self._queue.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _submit(self, autocommit, work, args, kwargs):
+        if self._closed:
+            raise Connection.InterfaceError("Executor is closed.")
+        pending = PendingResult()
+        self._queue.put((pending, autocommit, work, args, kwargs))
+        return pending
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending, autocommit, work, args, kwargs = item
+            cursor = self.connection.cursor(autocommit=autocommit)
+            try:
+                result = work(cursor, *args, **kwargs)
+                if not autocommit:
+                    self.connection.commit()
+            except Exception:
+                pending._fail(sys.exc_info()[1])
+                if not autocommit:
+                    try:
+                        self.connection.rollback()
+                    except self.connection.Error:
+                        pass
+            else:
+                pending._succeed(result)
+            finally:
+                cursor.close()
+
+
+class PendingResult(object):
+
+    """ The outcome of work handed to a ParallelExecutor, available once a worker has run it. """
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def done(self):
+        return self._done.is_set()
+
+    def result(self, timeout=None):
+        """ Waits for the work to finish and returns its result, or raises the exception it raised. """
+        if not self._done.wait(timeout):
+            raise Connection.OperationalError("Timed out waiting for the result.")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def exception(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise Connection.OperationalError("Timed out waiting for the result.")
+        return self._error
+
+    def _succeed(self, result):
+        self._result = result
+        self._done.set()
+
+    def _fail(self, error):
+        self._error = error
+        self._done.set()
+
+
+def _fetch_all(cursor, statement, *args, **kwargs):
+    return cursor.execute(statement, *args, **kwargs).fetchall()
@@ -0,0 +1,161 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from neo4j import connect
+from neo4j.connection import Connection
+from neo4j.prepared import StatementCache
+
+
+class ConnectionPool(object):
+
+    """
+    A bounded pool of connections to one database.
+
+    Connections are created on demand, up to max_size. When all of them are checked out, acquire() blocks until
+    one is released, or until timeout seconds have passed, in which case it raises OperationalError. Every
+    connection is opened with the pool's credentials.
+
+    On checkout, keep-alive sockets of the connection that the server has closed are dropped. Idle
+    connections that have not been used for idle_ttl seconds are closed, but the pool never shrinks below min_size.
+    Released connections are rolled back if they still have a transaction open.
+
+    The connections share one statement cache, statements. Statements passed as warm are prepared and planned
+    by the server, in a single round trip, when the pool is created. They also share result_cache, if one is given.
+
+    >>> pool = ConnectionPool("http://localhost:7474", "neo4j", "testing", max_size=4)
+    >>> with pool.connection() as connection:
+    ...     connection.cursor().execute("CREATE (n:User)")
+    ...     connection.commit()
+    """
+
+    def __init__(self, dsn, username=None, password=None, min_size=0, max_size=10, timeout=None, idle_ttl=300,
+                 warm=(), result_cache=None):
+        if max_size < 1 or min_size > max_size:
+            raise Connection.InterfaceError("Pool size must satisfy 0 <= min_size <= max_size and max_size >= 1.")
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_ttl = idle_ttl
+        self.statements = StatementCache()
+        self.result_cache = result_cache
+
+        self._username = username
+        self._password = password
+        self._lock = threading.Condition()
+        self._idle = []  # (connection, released_at), most recently released last
+        self._size = 0
+        self._closed = False
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.time()))
+            self._size += 1
+
+        warm = list(warm)
+        if warm:
+            with self.connection() as connection:
+                connection.warm(warm)
+
+    @property
+    def size(self):
+        """ Number of open connections, idle or checked out. """
+        return self._size
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    def acquire(self, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        deadline = None if timeout is None else time.time() + timeout
+
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise Connection.InterfaceError("Connection pool is closed.")
+                self._evict_idle()
+                if self._idle:
+                    connection, _ = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection = None
+                    break
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise Connection.OperationalError(
+                        "Timed out waiting for a connection, all %d are in use." % self.max_size)
+                self._lock.wait(remaining)
+
+        if connection is None:
+            try:
+                return self._connect()
+            except Exception:
+                self._discard()
+                raise
+
+        connection._close_stale()
+        return connection
+
+    def release(self, connection):
+        """ Returns a connection to the pool, rolling back any transaction it still has open. """
+        if connection._closed:
+            # Closed by its user
+            self._discard()
+            return
+        try:
+            connection.rollback()
+        except Connection.Error:
+            connection.close()
+            self._discard()
+            return
+
+        with self._lock:
+            if self._closed:
+                connection.close()
+                self._size -= 1
+                return
+            self._idle.append((connection, time.time()))
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self):
+        """ Checks a connection out for the duration of a with block. """
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            for connection, _ in self._idle:
+                connection.close()
+            self._size -= len(self._idle)
+            self._idle = []
+            self._lock.notify_all()
+
+    def _connect(self):
+        connection = connect(self.dsn, self._username, self._password)
+        connection._statements = self.statements
+        connection.result_cache = self.result_cache
+        return connection
+
+    def _discard(self):
+        with self._lock:
+            self._size -= 1
+            self._lock.notify()
+
+    def _evict_idle(self):
+        """ Closes connections idle for longer than idle_ttl, oldest first. Must hold the lock. """
+        if self.idle_ttl is None:
+            return
+        expired = time.time() - self.idle_ttl
+        while self._idle and self._size > self.min_size and self._idle[0][1] < expired:
+            connection, _ = self._idle.pop(0)
+            connection.close()
+            self._size -= 1
+
@@ -0,0 +1,83 @@
+"""
+Prepared statements.
+
+Neo4j caches query plans by statement text. A statement that takes its values as parameters is planned once, one
+with values written into its text is planned again for every new value. Connection.prepare() returns a
+PreparedStatement, which cursors execute just like statement text, and keeps track of how each statement is used:
+how often it is executed, with which parameter signatures, and whether it has literals that should have been
+parameters.
+"""
+import threading
+from collections import OrderedDict
+
+from neo4j import cypher
+from neo4j.strings import ustr
+
+
+class PreparedStatement(object):
+
+    def __init__(self, statement, lock):
+        self.statement = statement
+        self.parameters = frozenset(text for kind, text, _ in cypher.tokens(statement) if kind == 'param')
+        self.literals = cypher.literals(statement)
+        self.executions = 0
+        self.signatures = {}  # Parameter names and types to the number of executions with them
+        self._lock = lock
+
+    def __repr__(self):
+        return 'PreparedStatement(%r)' % self.statement
+
+    def _executed(self, parameters):
+        """ Records an execution, with parameters if known, returning the statement text to send. """
+        signature = None
+        if parameters is not None:
+            signature = tuple(sorted((ustr(k), type(v).__name__) for k, v in parameters.items()))
+        with self._lock:
+            self.executions += 1
+            if signature is not None:
+                self.signatures[signature] = self.signatures.get(signature, 0) + 1
+        return self.statement
+
+
+class StatementCache(object):
+
+    """
+    The prepared statements of a connection, or of all connections of a pool, keyed by normalized statement text.
+    At most max_size statements are kept, the least recently prepared are dropped first.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._statements = OrderedDict()
+        self._lock = threading.Lock()
+
+    def prepare(self, statement):
+        """ Returns (prepared statement, True if it was not in the cache). """
+        key = cypher.normalize(statement)
+        with self._lock:
+            prepared = self._statements.pop(key, None)
+            created = prepared is None
+            if created:
+                self.misses += 1
+                prepared = PreparedStatement(key, self._lock)
+            else:
+                self.hits += 1
+            self._statements[key] = prepared
+            while len(self._statements) > self.max_size:
+                self._statements.popitem(last=False)
+        return prepared, created
+
+    def hot(self, count=10):
+        """ The count most executed statements, most executed first. """
+        with self._lock:
+            statements = list(self._statements.values())
+        return sorted(statements, key=lambda p: p.executions, reverse=True)[:count]
+
+    def __len__(self):
+        return len(self._statements)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._statements.values()))
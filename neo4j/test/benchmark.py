@@ -0,0 +1,282 @@
+"""
+Benchmarks of the client against an in-process stand-in server, see neo4j.test.httpstub.
+
+The stub replays recorded response bodies, so nearly all of the time measured is spent in the client: encoding
+requests, decoding responses and mapping rows. Each scenario reports throughput, latency percentiles and the peak
+memory allocated per operation, which needs tracemalloc (python 3.4 and up).
+
+    python -m neo4j.test.benchmark --save baseline.json
+    ... change things ...
+    python -m neo4j.test.benchmark --compare baseline.json
+
+Compared to a baseline, scenarios that lost more than the tolerance in throughput, median latency or allocations
+are reported as regressions and the exit status is 1. Results only compare between runs on the same machine.
+"""
+import argparse
+import json
+import platform
+import sys
+import threading
+import time
+
+import neo4j
+from neo4j import jsoncodec
+from neo4j.bulk import BulkLoader
+from neo4j.pool import ConnectionPool
+from neo4j.test.httpstub import HttpStub, node, relationship
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+USERS = 5000
+NODES = 1000
+RELATIONSHIPS = 500
+
+
+def _users():
+    return [['user%d' % i, 20 + i % 50, 'user%d@example.com' % i] for i in range(USERS)]
+
+
+def _nodes():
+    return [[node(i, ['User'], {'name': 'user%d' % i, 'age': 20 + i % 50})] for i in range(NODES)]
+
+
+def _relationships():
+    return [[node(i, ['User'], {'name': 'user%d' % i}),
+             relationship(i, i, i + 1, 'KNOWS', {'since': 2000 + i % 20}),
+             node(i + 1, ['User'], {'name': 'user%d' % (i + 1)})] for i in range(RELATIONSHIPS)]
+
+
+class Handler(object):
+
+    """ Answers the statements of the scenarios, building each result once. """
+
+    def __init__(self):
+        self._results = {}
+
+    def __call__(self, statement, parameters):
+        if statement.startswith('MATCH (n:User) RETURN n.name'):
+            return self._result('users', ['n.name', 'n.age', 'n.email'], _users)
+        if statement.startswith('MATCH (n:User) RETURN n'):
+            return self._result('nodes', ['n'], _nodes)
+        if statement.startswith('MATCH (a:User)-[r:KNOWS]->(b:User)'):
+            return self._result('relationships', ['a', 'r', 'b'], _relationships)
+        if statement.startswith('MATCH (n:User) WHERE'):
+            return ['n.name'], [['user%d' % parameters['id']]]
+        return [], []
+
+    def _result(self, name, columns, rows):
+        if name not in self._results:
+            self._results[name] = (columns, rows())
+        return self._results[name]
+
+
+def small_writes(dsn):
+    """ A transaction of five small writes. """
+    connection = neo4j.connect(dsn)
+    cursor = connection.cursor()
+
+    def operation():
+        for i in range(5):
+            cursor.execute("CREATE (n:User {name:{name}})", name='user%d' % i)
+        connection.commit()
+    return operation, connection.close
+
+
+def batched_writes(dsn):
+    """ A transaction of a thousand writes sent as one batch. """
+    connection = neo4j.connect(dsn)
+    cursor = connection.cursor()
+    rows = [{'name': 'user%d' % i, 'age': 20 + i % 50} for i in range(1000)]
+
+    def operation():
+        cursor.executemany("CREATE (n:User {name:{name}, age:{age}})", rows)
+        connection.commit()
+    return operation, connection.close
+
+
+def _read(statement):
+    def setup(dsn):
+        connection = neo4j.connect(dsn)
+        cursor = connection.cursor(read_only=True)
+
+        def operation():
+            cursor.execute(statement)
+            cursor.fetchall()
+        return operation, connection.close
+    return setup
+
+
+def pool_contention(dsn):
+    """ Small reads on eight threads sharing a pool of two connections. """
+    pool = ConnectionPool(dsn, max_size=2)
+
+    def operation():
+        with pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("MATCH (n:User) WHERE id(n) = {id} RETURN n.name", id=1)
+            cursor.fetchall()
+            connection.commit()
+    return operation, pool.close
+
+
+def bulk_load(dsn):
+    """ Ten thousand records loaded in batches of a thousand, four at a time over a pool. """
+    pool = ConnectionPool(dsn, max_size=4)
+    loader = BulkLoader(pool, "CREATE (n:User {name:{name}, age:{age}})", batch_size=1000, concurrency=4)
+    records = [{'name': 'user%d' % i, 'age': 20 + i % 50} for i in range(10000)]
+
+    def operation():
+        loader.load(records)
+    return operation, pool.close
+
+
+# Name, setup, threads. Setup returns an operation to time and a function to clean up after.
+SCENARIOS = [
+    ('small_writes', small_writes, 1),
+    ('batched_writes', batched_writes, 1),
+    ('large_read', _read("MATCH (n:User) RETURN n.name, n.age, n.email"), 1),
+    ('node_read', _read("MATCH (n:User) RETURN n"), 1),
+    ('relationship_read', _read("MATCH (a:User)-[r:KNOWS]->(b:User) RETURN a, r, b"), 1),
+    ('pool_contention', pool_contention, 8),
+    ('bulk_load', bulk_load, 1),
+]
+
+
+def percentile(ordered, p):
+    """ The p-th percentile of a sorted list, p from 0 to 100. """
+    return ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))]
+
+
+def run(setup, dsn, iterations, warmup=10, threads=1):
+    """ Times iterations of a scenario, returning a dict of results. """
+    operation, close = setup(dsn)
+    try:
+        for _ in range(warmup):
+            operation()
+
+        latencies = []
+
+        def work(count):
+            timings = []
+            for _ in range(count):
+                started = time.time()
+                operation()
+                timings.append(time.time() - started)
+            latencies.extend(timings)
+
+        started = time.time()
+        if threads == 1:
+            work(iterations)
+        else:
+            workers = [threading.Thread(target=work, args=(iterations // threads,)) for _ in range(threads)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        elapsed = time.time() - started
+
+        latencies.sort()
+        result = {
+            'operations': len(latencies),
+            'ops_per_sec': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p90_ms': percentile(latencies, 90) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+        }
+        if tracemalloc is not None:
+            result['peak_bytes'] = _peak_allocated(operation, min(iterations, 20))
+        return result
+    finally:
+        close()
+
+
+def _peak_allocated(operation, samples):
+    """ The median, over samples, of the peak memory allocated while running operation once. """
+    peaks = []
+    for _ in range(samples):
+        tracemalloc.start()
+        try:
+            operation()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    peaks.sort()
+    return peaks[len(peaks) // 2]
+
+
+def compare(results, baseline, tolerance):
+    """ Returns a line of text per scenario comparing results to baseline, and the names of the scenarios that regressed. """
+    # Metric, and whether higher is better
+    metrics = [('ops_per_sec', True), ('p50_ms', False), ('peak_bytes', False)]
+    lines, regressed = [], []
+    for name, _, _ in SCENARIOS:
+        if name not in results or name not in baseline:
+            continue
+        changes = []
+        for metric, higher_is_better in metrics:
+            if metric not in results[name] or not baseline[name].get(metric):
+                continue
+            change = results[name][metric] / float(baseline[name][metric]) - 1
+            worse = -change if higher_is_better else change
+            if worse > tolerance:
+                regressed.append(name)
+            changes.append('%s %+.1f%%%s' % (metric, change * 100, ' REGRESSION' if worse > tolerance else ''))
+        lines.append('%-20s %s' % (name, ', '.join(changes)))
+    return lines, sorted(set(regressed))
+
+
+def _environment():
+    return {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+            'codec': jsoncodec.get().name}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks the client against an in-process stand-in server.")
+    parser.add_argument('scenarios', nargs='*', help="scenarios to run, all by default: %s" %
+                        ', '.join(name for name, _, _ in SCENARIOS))
+    parser.add_argument('-n', '--iterations', type=int, default=200, help="operations per scenario")
+    parser.add_argument('--save', metavar='FILE', help="save the results as a baseline")
+    parser.add_argument('--compare', metavar='FILE', help="compare the results to a saved baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="fraction a metric may get worse by before it is a regression, 0.2 by default")
+    args = parser.parse_args(argv)
+
+    names = args.scenarios or [name for name, _, _ in SCENARIOS]
+    unknown = set(names) - set(name for name, _, _ in SCENARIOS)
+    if unknown:
+        parser.error("unknown scenarios: %s" % ', '.join(sorted(unknown)))
+
+    results = {}
+    with HttpStub(Handler(), replay=True) as stub:
+        for name, setup, threads in SCENARIOS:
+            if name not in names:
+                continue
+            result = results[name] = run(setup, stub.dsn, args.iterations, threads=threads)
+            print('%-20s %9.1f ops/s  p50 %8.3fms  p90 %8.3fms  p99 %8.3fms%s' % (
+                name, result['ops_per_sec'], result['p50_ms'], result['p90_ms'], result['p99_ms'],
+                '  peak %8.1fkB' % (result['peak_bytes'] / 1024.0) if 'peak_bytes' in result else ''))
+
+    status = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('environment') != _environment():
+            print('Baseline was taken in a different environment: %s' % baseline.get('environment'))
+        lines, regressed = compare(results, baseline['results'], args.tolerance)
+        print('')
+        print('\n'.join(lines))
+        if regressed:
+            print('Regressions: %s' % ', '.join(regressed))
+            status = 1
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'environment': _environment(), 'results': results}, f, indent=2, sort_keys=True)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
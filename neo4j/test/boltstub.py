@@ -0,0 +1,153 @@
+"""
+A stand-in Bolt server for tests that should not need a running database.
+
+It speaks version 1 of the protocol over a real socket, but rather than running Cypher it hands each statement to
+a handler function, handler(statement, parameters), which returns (fields, records) or raises StubFailure.
+BEGIN, COMMIT and ROLLBACK are handled by the stub itself, and every statement received is logged.
+"""
+import socket
+import struct
+import threading
+
+from neo4j import bolt
+from neo4j.packstream import Structure, pack, unpack
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+
+class StubFailure(Exception):
+
+    def __init__(self, code, message):
+        Exception.__init__(self, message)
+        self.code = code
+        self.message = message
+
+
+class BoltStub(object):
+
+    def __init__(self, handler, credentials=None):
+        self.handler = handler
+        self.credentials = credentials
+        self.statements = []
+        self.transactions = []  # 'COMMIT' or 'ROLLBACK', as transactions end
+        self.sessions = 0
+        self._server = _Server(('127.0.0.1', 0), _Session)
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def dsn(self):
+        return 'bolt://%s:%d' % self._server.server_address
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _Session(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        stub = self.server.stub
+        self._file = self.request.makefile('rb')
+        if self._file.read(4) != b'\x60\x60\xB0\x17':
+            return
+        self._file.read(16)
+        self.request.sendall(struct.pack('>I', 1))
+
+        in_tx = False
+        failed = False
+        records = []
+        while True:
+            message = self._receive()
+            if message is None:
+                return
+            signature, fields = message.signature, message.fields
+
+            if signature == bolt.INIT:
+                auth = fields[1]
+                if stub.credentials is not None and \
+                        (auth.get('principal'), auth.get('credentials')) != stub.credentials:
+                    self._send(bolt.FAILURE, {'code': 'Neo.ClientError.Security.Unauthorized',
+                                              'message': 'The client is unauthorized.'})
+                    return
+                stub.sessions += 1
+                self._send(bolt.SUCCESS, {})
+            elif signature in (bolt.RESET, bolt.ACK_FAILURE):
+                if signature == bolt.RESET and in_tx:
+                    stub.transactions.append('ROLLBACK')
+                    in_tx = False
+                failed = False
+                self._send(bolt.SUCCESS, {})
+            elif failed:
+                self._send(bolt.IGNORED)
+            elif signature == bolt.RUN:
+                statement, parameters = fields
+                stub.statements.append((statement, parameters))
+                records = []
+                try:
+                    if statement in ('BEGIN', 'COMMIT', 'ROLLBACK'):
+                        if (statement == 'BEGIN') == in_tx:
+                            raise StubFailure('Neo.ClientError.Transaction.InvalidState', 'Invalid use of ' + statement)
+                        in_tx = statement == 'BEGIN'
+                        if not in_tx:
+                            stub.transactions.append(statement)
+                        columns = []
+                    else:
+                        columns, records = stub.handler(statement, parameters)
+                except StubFailure as e:
+                    failed = True
+                    self._send(bolt.FAILURE, {'code': e.code, 'message': e.message})
+                else:
+                    self._send(bolt.SUCCESS, {'fields': columns})
+            elif signature in (bolt.PULL_ALL, bolt.DISCARD_ALL):
+                if signature == bolt.PULL_ALL:
+                    for record in records:
+                        self._send(bolt.RECORD, list(record))
+                records = []
+                self._send(bolt.SUCCESS, {})
+
+    def _receive(self):
+        data = []
+        while True:
+            header = self._file.read(2)
+            if len(header) < 2:
+                return None
+            size = struct.unpack('>H', header)[0]
+            if size == 0:
+                break
+            data.append(self._file.read(size))
+        return unpack(b''.join(data))
+
+    def _send(self, signature, *fields):
+        data = pack(Structure(signature, list(fields)))
+        try:
+            self.request.sendall(struct.pack('>H', len(data)) + data + b'\x00\x00')
+        except socket.error:
+            pass
+
+
+def node(node_id, labels, properties):
+    return Structure(bolt.NODE, [node_id, labels, properties])
+
+
+def relationship(rel_id, start_id, end_id, rel_type, properties):
+    return Structure(bolt.RELATIONSHIP, [rel_id, start_id, end_id, rel_type, properties])
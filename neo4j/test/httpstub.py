@@ -0,0 +1,242 @@
+"""
+A stand-in for the transactional http endpoint, for tests and benchmarks that should not need a running database.
+
+Like the Bolt stub, it hands each statement to a handler function, handler(statement, parameters), which returns
+(columns, rows) or raises StubFailure, and answers in the format the client asked for with resultDataContents.
+Nodes and relationships in rows are given in the REST format, see node() and relationship().
+
+With replay, the stub records the response to every distinct request body and replays the recorded bytes when the
+same body is sent again, without decoding it or calling the handler. Benchmarks use this to keep the cost of the
+stub, which shares the process with the client, to a minimum. Only the commit url is filled in per request.
+"""
+import json
+import re
+import threading
+
+from neo4j.test.boltstub import StubFailure
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    import socketserver
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    import SocketServer as socketserver
+
+BASE = 'http://localhost:7474/db/data'
+
+EXPIRES = 'Fri, 01 Jan 2100 00:00:00 +0000'
+
+_TX_PATH = re.compile(r"^(?:https?://[^/]+)?/db/data/transaction(?:/(\d+))?(/commit)?/?$")
+
+
+class HttpStub(object):
+
+    def __init__(self, handler, replay=False):
+        self.handler = handler
+        self.replay = replay
+        self.statements = []  # Not logged for replayed requests
+        self.transactions = []  # 'COMMIT' or 'ROLLBACK', as transactions end
+        self.requests = 0
+        self._open = set()
+        self._ids = 0
+        self._recorded = {}
+        self._lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', 0), _Handler)
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def dsn(self):
+        return 'http://%s:%d' % self._server.server_address
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _begin(self):
+        with self._lock:
+            self._ids += 1
+            self._open.add(self._ids)
+            return self._ids
+
+    def _end(self, tx_id, outcome):
+        with self._lock:
+            if tx_id not in self._open:
+                return False
+            self._open.discard(tx_id)
+            self.transactions.append(outcome)
+            return True
+
+    def _respond(self, body, commit):
+        """ Returns the results, transaction and errors members of the response to a request body, as json. """
+        key = (body, commit)
+        if self.replay:
+            recorded = self._recorded.get(key)
+            if recorded is not None:
+                return recorded
+
+        statements = json.loads(body.decode('utf-8')).get('statements', []) if body else []
+        results, errors = [], []
+        for statement in statements:
+            parameters = statement.get('parameters') or {}
+            if not self.replay:
+                self.statements.append((statement['statement'], parameters))
+            try:
+                columns, rows = self.handler(statement['statement'], parameters)
+            except StubFailure as e:
+                errors.append({'code': e.code, 'message': e.message})
+                break
+            contents = statement.get('resultDataContents') or ['row']
+            results.append({'columns': columns, 'data': [_row(row, contents) for row in rows]})
+
+        members = {'results': results, 'errors': errors}
+        if not commit:
+            members['transaction'] = {'expires': EXPIRES}
+        out = json.dumps(members).encode('utf-8')[1:-1]
+        if self.replay:
+            self._recorded[key] = out
+        return out
+
+
+class _Server(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # Headers and body are written separately
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        stub = self.server.stub
+        stub.requests += 1
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        match = _TX_PATH.match(self.path)
+        if match is None:
+            return self._send(404, b'{"errors": []}')
+        tx_id, commit = match.group(1), match.group(2) is not None
+        headers = []
+        status = 200
+        if tx_id is None:
+            tx_id = stub._begin()
+            if not commit:
+                headers.append(('Location', '%s/transaction/%d' % (BASE, tx_id)))
+                status = 201
+        elif int(tx_id) not in stub._open:
+            return self._unknown()
+
+        members = stub._respond(body, commit)
+        if commit:
+            stub._end(int(tx_id), 'COMMIT')
+        prefix = ('{"commit":"%s/transaction/%s/commit",' % (BASE, tx_id)).encode('utf-8')
+        self._send(status, prefix + members + b'}', headers)
+
+    def do_DELETE(self):
+        stub = self.server.stub
+        stub.requests += 1
+        match = _TX_PATH.match(self.path)
+        if match is None or match.group(1) is None or not stub._end(int(match.group(1)), 'ROLLBACK'):
+            return self._unknown()
+        self._send(200, b'{"results":[],"errors":[]}')
+
+    def _unknown(self):
+        self._send(404, b'{"results":[],"errors":[{"code":"Neo.ClientError.Transaction.UnknownId",'
+                        b'"message":"Unrecognized transaction id. Transaction may have timed out and been rolled back."}]}')
+
+    def _send(self, status, body, headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def node(node_id, labels, properties):
+    """ A node in the REST format. """
+    url = '%s/node/%d' % (BASE, node_id)
+    return {
+        'self': url, 'labels': url + '/labels', 'properties': url + '/properties',
+        'property': url + '/properties/{key}', 'create_relationship': url + '/relationships',
+        'all_relationships': url + '/relationships/all', 'all_typed_relationships': url + '/relationships/all/{-list|&|types}',
+        'incoming_relationships': url + '/relationships/in', 'incoming_typed_relationships': url + '/relationships/in/{-list|&|types}',
+        'outgoing_relationships': url + '/relationships/out', 'outgoing_typed_relationships': url + '/relationships/out/{-list|&|types}',
+        'traverse': url + '/traverse/{returnType}', 'paged_traverse': url + '/paged/traverse/{returnType}{?pageSize,leaseTime}',
+        'extensions': {}, 'metadata': {'id': node_id, 'labels': list(labels)}, 'data': properties,
+    }
+
+
+def relationship(rel_id, start_id, end_id, rel_type, properties):
+    """ A relationship in the REST format. """
+    url = '%s/relationship/%d' % (BASE, rel_id)
+    return {
+        'self': url, 'properties': url + '/properties', 'property': url + '/properties/{key}',
+        'start': '%s/node/%d' % (BASE, start_id), 'end': '%s/node/%d' % (BASE, end_id), 'type': rel_type,
+        'extensions': {}, 'metadata': {'id': rel_id, 'type': rel_type}, 'data': properties,
+    }
+
+
+def _row(row, contents):
+    out = {}
+    for kind in contents:
+        if kind == 'rest':
+            out['rest'] = row
+        elif kind == 'row':
+            out['row'] = [_plain(value) for value in row]
+        elif kind == 'graph':
+            nodes, relationships = {}, {}
+            for value in row:
+                _collect(value, nodes, relationships)
+            out['graph'] = {'nodes': list(nodes.values()), 'relationships': list(relationships.values())}
+    return out
+
+
+def _is_element(value):
+    return isinstance(value, dict) and 'metadata' in value and 'self' in value
+
+
+def _plain(value):
+    """ A value the way the row format sends it: nodes and relationships as their properties. """
+    if _is_element(value):
+        return value['data']
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return dict((k, _plain(v)) for k, v in value.items())
+    return value
+
+
+def _collect(value, nodes, relationships):
+    if _is_element(value):
+        element_id = str(value['metadata']['id'])
+        if 'type' in value:
+            relationships[element_id] = {'id': element_id, 'type': value['type'],
+                                         'startNode': value['start'].split('/')[-1],
+                                         'endNode': value['end'].split('/')[-1], 'properties': value['data']}
+        else:
+            nodes[element_id] = {'id': element_id, 'labels': value['metadata']['labels'],
+                                 'properties': value['data']}
+    elif isinstance(value, list):
+        for v in value:
+            _collect(v, nodes, relationships)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _collect(v, nodes, relationships)
@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+
+import neo4j
+import neo4j.aio
+
+
+class TestAio(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.conn = self.run_async(neo4j.aio.connect("http://localhost:7474", "neo4j", "testing"))
+
+    def tearDown(self):
+        self.run_async(self.conn.rollback())
+        self.run_async(self.conn.close())
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_execute_and_iterate(self):
+        # Given
+        cursor = self.conn.cursor()
+        self.run_async(cursor.execute("CREATE (n:AioParams {name:{0}})", "Bob"))
+
+        # When
+        async def read():
+            await cursor.execute("MATCH (n:AioParams) RETURN n")
+            return [row async for row in cursor]
+        rows = self.run_async(read())
+
+        # Then
+        self.assertEqual(rows, [({'name': 'Bob'},)])
+        self.assertEqual(rows[0][0].labels, ['AioParams'])
+
+    def test_syntax_error(self):
+        # Given
+        cursor = self.conn.cursor()
+
+        # When
+        try:
+            self.run_async(cursor.execute("this is not valid syntax"))
+            raise Exception("Should not have reached here.")
+        except neo4j.ProgrammingError as e:
+            # Then
+            self.assertTrue(str(e).startswith("Neo.ClientError.Statement.InvalidSyntax"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from neo4j.test import benchmark
+from neo4j.test.httpstub import HttpStub
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_scenarios_run_against_stub(self):
+        # Given
+        stub = HttpStub(benchmark.Handler(), replay=True).start()
+
+        try:
+            # When
+            results = dict((name, benchmark.run(setup, stub.dsn, 8, warmup=1, threads=threads))
+                           for name, setup, threads in benchmark.SCENARIOS)
+        finally:
+            stub.stop()
+
+        # Then
+        for name, result in results.items():
+            self.assertEqual(result['operations'], 8, name)
+            self.assertTrue(result['p50_ms'] <= result['p99_ms'], name)
+        self.assertEqual(stub.transactions.count('ROLLBACK'), 0)
+
+    def test_compare_reports_regressions(self):
+        # Given
+        baseline = {'small_writes': {'ops_per_sec': 1000, 'p50_ms': 1.0},
+                    'large_read': {'ops_per_sec': 100, 'p50_ms': 10.0}}
+        results = {'small_writes': {'ops_per_sec': 950, 'p50_ms': 1.1},
+                   'large_read': {'ops_per_sec': 50, 'p50_ms': 20.0}}
+
+        # When
+        lines, regressed = benchmark.compare(results, baseline, 0.2)
+
+        # Then
+        self.assertEqual(regressed, ['large_read'])
+        self.assertEqual(len(lines), 2)
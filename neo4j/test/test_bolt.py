@@ -0,0 +1,247 @@
+import unittest
+
+import neo4j
+from neo4j import packstream
+from neo4j.cache import ResultCache
+from neo4j.instrumentation import StatsObserver
+from neo4j.test.boltstub import BoltStub, StubFailure, node, relationship
+
+
+def handler(statement, parameters):
+    if statement == 'RETURN {x}':
+        return ['x'], [[parameters['x']]]
+    if statement == 'ROWS':
+        return ['i', 'name'], [[i, 'row %d' % i] for i in range(parameters['n'])]
+    if statement == 'MATCH (n) RETURN n SKIP {page_skip} LIMIT {page_limit}':
+        skip, limit = parameters['page_skip'], parameters['page_limit']
+        return ['n'], [[i] for i in range(skip, min(skip + limit, 7))]
+    if statement == 'MATCH (n:User) RETURN n.name':
+        return ['n.name'], [['Bob']]
+    if statement == 'GRAPH':
+        return ['n', 'r'], [[node(1, ['User'], {'name': 'Bob'}), relationship(7, 1, 2, 'KNOWS', {'since': 2012})]]
+    if statement == 'NEIGHBOURS':
+        return ['n', 'm'], [[node(1, ['User'], {}), node(i, ['User'], {})] for i in range(2, 5)]
+    if statement == 'ERROR':
+        raise StubFailure('Neo.ClientError.Statement.InvalidSyntax', 'Invalid input')
+    return [], []
+
+
+class TestPackStream(unittest.TestCase):
+
+    def test_round_trip(self):
+        for value in [None, True, False, 0, -16, 127, -129, 40000, -2 ** 40, 1.5, '', 'abc', 'x' * 300,
+                      b'\x00\xff', [1, [2, 'three']], {'a': {'b': [None]}}, packstream.Structure(0x4E, [1, [], {}])]:
+            self.assertEqual(packstream.unpack(packstream.pack(value)), value)
+
+    def test_structure_hook(self):
+        # When
+        value = packstream.unpack(packstream.pack([packstream.Structure(1, [2])]), lambda s, f: (s, f))
+
+        # Then
+        self.assertEqual(value, [(1, [2])])
+
+
+class TestBolt(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = BoltStub(handler, credentials=('neo4j', 'testing')).start()
+        self.conn = neo4j.connect(self.stub.dsn, 'neo4j', 'testing')
+
+    def tearDown(self):
+        self.conn.close()
+        self.stub.stop()
+
+    def test_connect(self):
+        self.assertTrue(isinstance(self.conn, neo4j.BoltConnection))
+
+    def test_native_types(self):
+        # Given
+        cursor = self.conn.cursor()
+
+        # When
+        rows = [cursor.execute("RETURN {x}", x=x).fetchone()[0] for x in [12, 1.5, b'\x01\x02', 'text', [1, None]]]
+
+        # Then
+        self.assertEqual(rows, [12, 1.5, b'\x01\x02', 'text', [1, None]])
+        self.assertTrue(isinstance(rows[0], int))
+
+    def test_fetch(self):
+        # Given
+        cursor = self.conn.cursor()
+
+        # When
+        cursor.execute("ROWS", n=3)
+
+        # Then
+        self.assertEqual(cursor.rowcount, 3)
+        self.assertEqual([d[0] for d in cursor.description], ['i', 'name'])
+        self.assertEqual(cursor.fetchall(), [(0, 'row 0'), (1, 'row 1'), (2, 'row 2')])
+
+    def test_streaming(self):
+        # Given
+        cursor = self.conn.cursor(stream=True)
+
+        # When
+        cursor.execute("ROWS", n=5)
+
+        # Then
+        self.assertEqual(cursor.fetchmany(2), [(0, 'row 0'), (1, 'row 1')])
+        self.assertEqual(len(cursor.fetchall()), 3)
+        self.assertEqual(cursor.rowcount, 5)
+
+    def test_fetch_columns(self):
+        # Given
+        cursor = self.conn.cursor()
+
+        # When
+        cursor.execute("ROWS", n=3)
+
+        # Then
+        self.assertEqual(cursor.fetchone(), (0, 'row 0'))
+        self.assertEqual(list(cursor.fetch_columns().items()), [('i', [1, 2]), ('name', ['row 1', 'row 2'])])
+
+    def test_paging(self):
+        # Given
+        cursor = self.conn.cursor(page_size=3)
+
+        # When
+        rows = cursor.execute("MATCH (n) RETURN n").fetchall()
+
+        # Then
+        self.assertEqual(rows, [(i,) for i in range(7)])
+        self.assertEqual(cursor.rowcount, 7)
+        pages = [(s, p) for s, p in self.stub.statements if s != 'BEGIN']
+        self.assertEqual([p['page_skip'] for _, p in pages], [0, 3, 6])
+
+    def test_graph_types(self):
+        # When
+        n, r = self.conn.cursor().execute("GRAPH").fetchone()
+
+        # Then
+        self.assertEqual((n.id, n.labels, n['name']), ('1', ['User'], 'Bob'))
+        self.assertEqual((r.id, r.type, r.start_id, r.end_id, r['since']), ('7', 'KNOWS', '1', '2', 2012))
+
+    def test_identity_map(self):
+        # Given
+        cursor = self.conn.cursor(identity_map='result')
+
+        # When
+        rows = cursor.execute("NEIGHBOURS").fetchall()
+
+        # Then
+        self.assertTrue(rows[0][0] is rows[1][0] is rows[2][0])
+        nodes, relationships = cursor.graph
+        self.assertEqual(sorted(n.id for n in nodes), ['1', '2', '3', '4'])
+        self.assertEqual(relationships, [])
+
+    def test_result_cache(self):
+        # Given
+        self.conn.result_cache = ResultCache()
+        cursor = self.conn.cursor(cached=True)
+        cursor.execute("MATCH (n:User) RETURN n.name").fetchall()
+        self.conn.rollback()
+
+        # When
+        rows = cursor.execute("MATCH (n:User) RETURN n.name").fetchall()
+        cursor.execute("CREATE (n:Movie)")
+        self.conn.commit()
+        cursor.execute("MATCH (n:User) RETURN n.name").fetchall()
+        cursor.execute("CREATE (n:User)")
+        self.conn.commit()
+        cursor.execute("MATCH (n:User) RETURN n.name").fetchall()
+
+        # Then
+        self.assertEqual(rows, [('Bob',)])
+        reads = [s for s, _ in self.stub.statements if s.startswith('MATCH')]
+        self.assertEqual(len(reads), 2)
+        self.assertEqual((self.conn.result_cache.hits, self.conn.result_cache.misses), (2, 2))
+
+    def test_read_only(self):
+        # Given
+        cursor = self.conn.cursor(read_only=True)
+
+        # When
+        cursor.execute("ROWS", n=1).fetchall()
+        cursor.execute("CREATE (n)").fetchall()
+        cursor.execute("ROWS", n=1).fetchall()
+        self.conn.rollback()
+
+        # Then
+        self.assertEqual([s for s, _ in self.stub.statements], ['ROWS', 'BEGIN', 'CREATE (n)', 'ROWS', 'ROLLBACK'])
+
+    def test_observers(self):
+        # Given
+        stats = StatsObserver()
+        self.conn.observers.append(stats)
+
+        # When
+        self.conn.cursor().execute("ROWS", n=3).fetchall()
+        self.conn.commit()
+
+        # Then
+        self.assertEqual(stats.rows, 3)
+        self.assertEqual(stats.transactions, {'begin': 1, 'commit': 1})
+
+    def test_commit(self):
+        # Given
+        cursor = self.conn.cursor()
+        cursor.execute("CREATE (n)")
+        cursor.execute("CREATE (m)")
+
+        # When
+        self.conn.commit()
+
+        # Then
+        self.assertEqual([s for s, _ in self.stub.statements], ['BEGIN', 'CREATE (n)', 'CREATE (m)', 'COMMIT'])
+        self.assertEqual(self.stub.transactions, ['COMMIT'])
+
+    def test_results_read_after_commit(self):
+        # Given
+        self.conn.cursor().execute("CREATE (n)")
+        cursor = self.conn.cursor().execute("RETURN {x}", x=1)
+
+        # When
+        self.conn.commit()
+
+        # Then
+        self.assertEqual(cursor.fetchall(), [(1,)])
+        self.assertEqual([s for s, _ in self.stub.statements], ['BEGIN', 'CREATE (n)', 'RETURN {x}', 'COMMIT'])
+
+    def test_rollback(self):
+        # Given
+        self.conn.cursor().execute("ROWS", n=1).fetchall()
+
+        # When
+        self.conn.rollback()
+
+        # Then
+        self.assertEqual([s for s, _ in self.stub.statements], ['BEGIN', 'ROWS', 'ROLLBACK'])
+        self.assertEqual(self.stub.transactions, ['ROLLBACK'])
+
+    def test_error(self):
+        # Given
+        cursor = self.conn.cursor()
+
+        # When
+        try:
+            cursor.execute("ERROR").fetchall()
+            raise Exception("Should not have reached here.")
+        except neo4j.ProgrammingError as e:
+            # Then
+            self.assertTrue('InvalidSyntax' in str(e))
+
+        # And the session can be used again
+        self.assertEqual(cursor.execute("RETURN {x}", x=1).fetchone(), (1,))
+
+    def test_unauthorized(self):
+        # Given
+        conn = neo4j.connect(self.stub.dsn, 'neo4j', 'wrong')
+
+        # When
+        try:
+            conn.cursor().execute("RETURN {x}", x=1).fetchone()
+            raise Exception("Should not have reached here.")
+        except neo4j.OperationalError:
+            pass
+        finally:
+            conn.close()
@@ -0,0 +1,90 @@
+import io
+import unittest
+
+import neo4j
+from neo4j.bulk import BulkLoader, csv_records, ndjson_records
+from neo4j.pool import ConnectionPool
+from neo4j.test.boltstub import StubFailure
+from neo4j.test.httpstub import HttpStub
+
+
+class TestBulkLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.loaded = []
+        self.fail_on = None
+        self.stub = HttpStub(self._handle).start()
+
+    def tearDown(self):
+        self.stub.stop()
+
+    def _handle(self, statement, parameters):
+        names = [row['name'] for row in parameters.get('rows', [parameters])]
+        if self.fail_on in names:
+            raise StubFailure('Neo.TransientError.General.DatabaseUnavailable', 'Database unavailable')
+        self.loaded.extend(names)
+        return [], []
+
+    def test_load_in_batches(self):
+        # Given
+        offsets = []
+        loader = BulkLoader(neo4j.connect(self.stub.dsn), "CREATE (n:User {name:{name}})", batch_size=4,
+                            on_commit=offsets.append)
+
+        # When
+        offset = loader.load({'name': 'user%d' % i} for i in range(10))
+
+        # Then each batch is one statement, sent with its commit
+        self.assertEqual(offset, 10)
+        self.assertEqual(offsets, [4, 8, 10])
+        self.assertEqual(self.loaded, ['user%d' % i for i in range(10)])
+        self.assertEqual(self.stub.requests, 3)
+        self.assertEqual(self.stub.statements[0][0], "UNWIND {rows} AS row CREATE (n:User {name:row.name})")
+
+    def test_resume_after_failure(self):
+        # Given
+        records = [{'name': 'user%d' % i} for i in range(10)]
+        loader = BulkLoader(neo4j.connect(self.stub.dsn), "CREATE (n:User {name:{name}})", batch_size=3)
+        self.fail_on = 'user7'
+
+        # When
+        self.assertRaises(neo4j.Connection.DatabaseError, loader.load, records)
+        self.fail_on = None
+        offset = loader.load(records, offset=loader.offset)
+
+        # Then
+        self.assertEqual(offset, 10)
+        self.assertEqual(self.loaded, ['user%d' % i for i in range(10)])
+
+    def test_concurrent_batches_over_pool(self):
+        # Given
+        pool = ConnectionPool(self.stub.dsn, max_size=4)
+        offsets = []
+        loader = BulkLoader(pool, "CREATE (n:User {name:{name}})", batch_size=10, concurrency=4,
+                            on_commit=offsets.append)
+
+        # When
+        offset = loader.load({'name': 'user%d' % i} for i in range(1000))
+        pool.close()
+
+        # Then
+        self.assertEqual(offset, 1000)
+        self.assertEqual(sorted(self.loaded), sorted('user%d' % i for i in range(1000)))
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertEqual(self.stub.transactions, ['COMMIT'] * 100)
+
+
+class TestRecords(unittest.TestCase):
+
+    def test_csv(self):
+        self.assertEqual([dict(r) for r in csv_records(io.StringIO(u"name,age\nBob,42\n"))],
+                         [{'name': 'Bob', 'age': '42'}])
+        self.assertEqual(list(csv_records(io.StringIO(u"Bob,42\n"), header=False)), [['Bob', '42']])
+
+    def test_ndjson(self):
+        self.assertEqual(list(ndjson_records(io.StringIO(u'{"name": "Bob"}\n\n{"name": "Alice"}\n'))),
+                         [{'name': 'Bob'}, {'name': 'Alice'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import time
+import unittest
+
+from neo4j.cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        # Given
+        cache = ResultCache()
+        key = cache.key("MATCH (n:User) RETURN n", {'x': 1})
+        cache.put(key, frozenset(['User']), ['n'], [[1]], 10, cache.generation)
+
+        # When
+        hit = cache.get(cache.key("MATCH  (n:User)\n RETURN n", {'x': 1}))
+        miss = cache.get(cache.key("MATCH (n:User) RETURN n", {'x': 2}))
+
+        # Then
+        self.assertEqual(hit, (['n'], [[1]]))
+        self.assertEqual(miss, None)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_expires_results(self):
+        # Given
+        cache = ResultCache(ttl=0.01)
+        cache.put('key', frozenset(), [], [], 10, cache.generation)
+
+        # When
+        time.sleep(0.02)
+
+        # Then
+        self.assertEqual(cache.get('key'), None)
+        self.assertEqual(cache.size, 0)
+
+    def test_evicts_least_recently_used(self):
+        # Given
+        cache = ResultCache(max_entries=2, max_bytes=25)
+        cache.put('a', frozenset(), [], [], 10, cache.generation)
+        cache.put('b', frozenset(), [], [], 10, cache.generation)
+        cache.get('a')
+
+        # When
+        cache.put('c', frozenset(), [], [], 10, cache.generation)
+        cache.put('d', frozenset(), [], [], 100, cache.generation)
+
+        # Then
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('d'), None)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.size, 20)
+
+    def test_invalidates_by_label(self):
+        # Given
+        cache = ResultCache()
+        cache.put('users', frozenset(['User']), [], [], 10, cache.generation)
+        cache.put('movies', frozenset(['Movie']), [], [], 10, cache.generation)
+        cache.put('anything', None, [], [], 10, cache.generation)
+
+        # When
+        cache.invalidate(frozenset(['User']))
+
+        # Then
+        self.assertEqual([k for k in ['users', 'movies', 'anything'] if cache.get(k) is not None], ['movies'])
+
+    def test_does_not_store_results_read_before_an_invalidation(self):
+        # Given
+        cache = ResultCache()
+        generation = cache.generation
+
+        # When
+        cache.invalidate(frozenset(['User']))
+        cache.put('users', frozenset(['User']), [], [], 10, generation)
+
+        # Then
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
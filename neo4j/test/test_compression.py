@@ -0,0 +1,46 @@
+import io
+import json
+import unittest
+import zlib
+
+from neo4j import compression
+from neo4j.jsonstream import TransactionResponse
+
+
+BODY = json.dumps({'results': [{'columns': ['n'], 'data': [{'rest': [i]} for i in range(1000)]}],
+                   'errors': []}).encode('utf-8')
+
+
+class TestDecompressingReader(unittest.TestCase):
+
+    def test_encodings(self):
+        # Given
+        raw = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        bodies = [('gzip', compression.compress(BODY)), ('deflate', zlib.compress(BODY)),
+                  ('deflate', raw.compress(BODY) + raw.flush())]
+
+        for encoding, body in bodies:
+            # When
+            reader = compression.DecompressingReader(io.BytesIO(body), encoding, chunk_size=16)
+
+            # Then
+            self.assertEqual(reader.read(5) + reader.read(), BODY)
+            self.assertEqual(reader.read(5), b'')
+
+    def test_streams_into_incremental_parsing(self):
+        # Given
+        stats = compression.Stats()
+        body = compression.compress(BODY)
+        reader = compression.DecompressingReader(io.BytesIO(body), 'gzip', stats, chunk_size=64)
+
+        # When
+        rows = list(next(iter(TransactionResponse(reader, chunk_size=100))))
+
+        # Then
+        self.assertEqual(len(rows), 1000)
+        self.assertEqual((stats.response_bytes_received, stats.response_bytes), (len(body), len(BODY)))
+        self.assertEqual(stats.saved, len(BODY) - len(body))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import threading
+import time
 import unittest
 
 import neo4j
@@ -63,6 +65,49 @@ class TestConnection(unittest.TestCase):
         cursor.execute("MATCH (n:TestRollback) RETURN n.name")
         self.assertEqual(cursor.rowcount, 0)
 
+    def test_expires(self):
+        # Given
+        cursor = self.conn.cursor()
+
+        # When
+        cursor.execute("MATCH (n) RETURN count(n)").fetchall()
+
+        # Then
+        self.assertTrue(time.time() < self.conn.expires < time.time() + 3600)
+
+        # And the expiry is gone with the transaction
+        self.conn.rollback()
+        self.assertEqual(self.conn.expires, None)
+
+    def test_threads_run_separate_transactions(self):
+        # Given
+        created = threading.Event()
+        seen = []
+
+        def write():
+            cursor = self.conn.cursor()
+            cursor.execute("CREATE (n:TestThreads {name:1337})")
+            cursor.rowcount  # Force client to execute
+            created.set()
+
+        def read():
+            created.wait()
+            cursor = self.conn.cursor()
+            cursor.execute("MATCH (n:TestThreads) RETURN n.name")
+            seen.append(cursor.rowcount)
+            self.conn.rollback()
+
+        # When
+        writer = threading.Thread(target=write)
+        reader = threading.Thread(target=read)
+        writer.start()
+        reader.start()
+        writer.join()
+        reader.join()
+
+        # Then the reader runs its own transaction and should not see it
+        self.assertEqual(seen, [0])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -2,6 +2,11 @@ import unittest
 
 import neo4j
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class TestCursor(unittest.TestCase):
 
@@ -134,6 +139,137 @@ class TestCursor(unittest.TestCase):
             # Then
             pass
 
+    def test_streaming(self):
+        # Given
+        cursor = self.conn.cursor(stream=True)
+
+        # When
+        cursor.execute("""FOREACH (n IN [1,2,3,4,5,6,7]| CREATE (:Test { id:n }))
+                          WITH 1 AS p
+                          MATCH (k:Test)
+                          RETURN k.id AS id ORDER BY id""")
+
+        # Then
+        self.assertEqual(cursor.rowcount, -1)
+        self.assertEqual(cursor.fetchone(), (1,))
+        self.assertEqual(cursor.fetchmany(2), [(2,), (3,)])
+        cursor.scroll(1)
+        self.assertEqual(cursor.fetchall(), [(5,), (6,), (7,)])
+        self.assertEqual(cursor.rowcount, 7)
+        self.assertEqual(cursor.fetchall(), [])
+
+    def test_nextset(self):
+        # Given
+        cursor = self.conn.cursor(batch=True)
+
+        # When
+        cursor.execute("RETURN 1")
+        cursor.execute("RETURN 2")
+
+        # Then
+        self.assertEqual(cursor.fetchall(), [(1,)])
+        self.assertTrue(cursor.nextset())
+        self.assertEqual(cursor.fetchall(), [(2,)])
+        self.assertEqual(cursor.nextset(), None)
+
+    def test_executemany(self):
+        # Given
+        cursor = self.conn.cursor()
+
+        # When
+        cursor.executemany("CREATE (n:TestMany {id:{id}})", [{'id': i} for i in range(10)], batch_size=3)
+
+        # Then
+        cursor.execute("MATCH (n:TestMany) RETURN n.id AS id ORDER BY id")
+        self.assertEqual(cursor.fetchall(), [(i,) for i in range(10)])
+
+    def test_rows_that_change_shape(self):
+        # Given
+        cursor = self.conn.cursor()
+        node = {'self': 'http://localhost:7474/db/data/node/1', 'metadata': {'id': 1, 'labels': ['User']},
+                'data': {'name': 'Bob'}}
+
+        # When
+        first = cursor._map_row({'rest': [1, node, [1, 2]]})
+        second = cursor._map_row({'rest': [node, None, [node]]})
+
+        # Then
+        self.assertEqual(first, (1, {'name': 'Bob'}, [1, 2]))
+        self.assertEqual(first[1].labels, ['User'])
+        self.assertEqual(second, ({'name': 'Bob'}, None, [{'name': 'Bob'}]))
+        self.assertTrue(isinstance(second[0], neo4j.Node))
+        self.assertTrue(isinstance(second[2][0], neo4j.Node))
+
+    def test_result_formats(self):
+        # Given
+        self.conn.cursor().execute("CREATE (:Formats {name:'Bob'})-[:KNOWS {since:2012}]->(:Formats)")
+
+        # When
+        row = self.conn.cursor(result_format='row').execute(
+            "MATCH (n:Formats {name:'Bob'})-[r]->() RETURN n, r").fetchone()
+        graph = self.conn.cursor(result_format='graph').execute(
+            "MATCH (n:Formats {name:'Bob'})-[r]->() RETURN n, r").fetchone()
+
+        # Then
+        self.assertEqual(row, ({'name': 'Bob'}, {'since': 2012}))
+        nodes, relationships = graph
+        self.assertEqual(nodes[0].labels, ['Formats'])
+        self.assertEqual(relationships[0].type, 'KNOWS')
+        self.assertEqual(relationships[0].start_id, nodes[0].id)
+
+    def test_identity_map(self):
+        # Given
+        cursor = self.conn.cursor(identity_map='transaction')
+        cursor.execute("CREATE (n:Identity)-[:KNOWS]->(), (n)-[:KNOWS]->()")
+
+        # When
+        first = cursor.execute("MATCH (n:Identity)-[r]->(m) RETURN n").fetchall()
+        second = cursor.execute("MATCH (n:Identity) RETURN n").fetchone()
+
+        # Then
+        self.assertTrue(first[0][0] is first[1][0] is second[0])
+        self.assertEqual(len(cursor.graph[0]), 1)
+
+    def test_fetch_columns(self):
+        # Given
+        cursor = self.conn.cursor()
+
+        # When
+        columns = cursor.execute("UNWIND [1, 2, 3] AS i RETURN i, i * 0.5 AS half, 'n' + i AS name").fetch_columns()
+
+        # Then
+        self.assertEqual(list(columns.keys()), ['i', 'half', 'name'])
+        self.assertEqual(columns['i'], [1, 2, 3])
+        self.assertEqual(columns['name'], ['n1', 'n2', 'n3'])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_fetch_numpy(self):
+        # Given
+        cursor = self.conn.cursor()
+
+        # When
+        columns = cursor.execute("UNWIND [1, 2, 3] AS i RETURN i, i * 0.5 AS half, i > 1 AS big, 'n' + i AS name")\
+            .fetch_numpy()
+
+        # Then
+        self.assertEqual(columns['i'].dtype, numpy.int64)
+        self.assertEqual(columns['half'].dtype, numpy.float64)
+        self.assertEqual(columns['big'].dtype, numpy.bool_)
+        self.assertEqual(columns['name'].dtype, object)
+
+    def test_paging(self):
+        # Given
+        cursor = self.conn.cursor(page_size=10)
+
+        # When
+        cursor.execute("UNWIND range(0, 24) AS i RETURN i ORDER BY i")
+
+        # Then
+        self.assertEqual(cursor.fetchmany(12), [(i,) for i in range(12)])
+        self.assertEqual(cursor.rowcount, -1)
+        self.assertEqual(cursor.fetchall(), [(i,) for i in range(12, 25)])
+        self.assertEqual(cursor.rowcount, 25)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,81 @@
+import unittest
+
+from neo4j import cypher
+
+
+class TestUnwind(unittest.TestCase):
+
+    def test_named_parameters(self):
+        self.assertEqual(cypher.unwind("CREATE (n:User {name:{name}, age: {age}})"),
+                         "UNWIND {rows} AS row CREATE (n:User {name:row.name, age: row.age})")
+
+    def test_positional_parameters(self):
+        self.assertEqual(cypher.unwind("MATCH (n) WHERE n.id = {0} SET n.x = {1}"),
+                         "UNWIND {rows} AS row MATCH (n) WHERE n.id = row.`0` SET n.x = row.`1`")
+
+    def test_leaves_strings_alone(self):
+        self.assertEqual(cypher.unwind("CREATE (n {name: '{name}', a: {a}})"),
+                         "UNWIND {rows} AS row CREATE (n {name: '{name}', a: row.a})")
+
+    def test_avoids_identifier_clashes(self):
+        self.assertEqual(cypher.unwind("MATCH (row) WHERE row.id IN {ids} DELETE row"),
+                         "UNWIND {rows} AS row_ MATCH (row) WHERE row.id IN row_.ids DELETE row")
+
+    def test_refuses_unsafe_statements(self):
+        self.assertEqual(cypher.unwind("CREATE (n:User {props})"), None)
+        self.assertEqual(cypher.unwind("MATCH (n) WHERE n.id = {id} RETURN n"), None)
+        self.assertEqual(cypher.unwind("MATCH (n) WITH count(n) AS c CREATE (:Count {c: c, at: {at}})"), None)
+
+    def test_keywords_used_as_names(self):
+        self.assertEqual(cypher.unwind("MATCH (n:Order) SET n.start = {start}"),
+                         "UNWIND {rows} AS row MATCH (n:Order) SET n.start = row.start")
+
+
+class TestNormalize(unittest.TestCase):
+
+    def test_collapses_whitespace_and_comments(self):
+        self.assertEqual(cypher.normalize("MATCH  (n) // all\n  WHERE n.name = 'a  b' /* x */ RETURN n;"),
+                         "MATCH (n) WHERE n.name = 'a  b' RETURN n")
+
+
+class TestLiterals(unittest.TestCase):
+
+    def test_finds_values(self):
+        self.assertEqual(cypher.literals("MATCH (n:L2 {name: 'Bob'}) WHERE n.age > 42 AND n.x = {x} RETURN n"),
+                         ["'Bob'", '42'])
+
+    def test_ignores_numbers_that_are_not_values(self):
+        self.assertEqual(cypher.literals("MATCH (n)-[*1..3]->(m) RETURN labels(m)[0], `col 1` SKIP 5 LIMIT 10"), [])
+
+
+class TestPaginate(unittest.TestCase):
+
+    def test_appends_skip_and_limit(self):
+        self.assertEqual(cypher.paginate("MATCH (n) RETURN n ORDER BY n.name;", 'skip', 'limit'),
+                         "MATCH (n) RETURN n ORDER BY n.name SKIP {skip} LIMIT {limit}")
+
+    def test_keywords_used_as_names(self):
+        self.assertEqual(cypher.paginate("MATCH (n {name: 'SET'}) RETURN n.limit"),
+                         "MATCH (n {name: 'SET'}) RETURN n.limit SKIP {skip} LIMIT {limit}")
+
+    def test_refuses_unsafe_statements(self):
+        self.assertEqual(cypher.paginate("MATCH (n) RETURN n LIMIT 10"), None)
+        self.assertEqual(cypher.paginate("MATCH (n) SET n.seen = true RETURN n"), None)
+        self.assertEqual(cypher.paginate("MATCH (n) RETURN n UNION MATCH (n) RETURN n"), None)
+        self.assertEqual(cypher.paginate("MATCH (n) WITH n RETURN n.x AS x WITH x"), None)
+
+
+class TestWrites(unittest.TestCase):
+
+    def test_writing_clauses(self):
+        self.assertTrue(cypher.writes("CREATE (n:User)"))
+        self.assertTrue(cypher.writes("MATCH (n) DETACH DELETE n"))
+        self.assertFalse(cypher.writes("MATCH (n {name: 'CREATE'}) RETURN n.set"))
+
+    def test_labels(self):
+        self.assertEqual(cypher.labels("MATCH (a:User)-[:KNOWS]->(b:User) RETURN b"), frozenset(['User', 'KNOWS']))
+        self.assertEqual(cypher.labels("MATCH (a:User)-->(b) RETURN b"), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
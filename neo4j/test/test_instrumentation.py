@@ -0,0 +1,43 @@
+import unittest
+
+from neo4j.instrumentation import Histogram, StatsObserver
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_percentiles(self):
+        # Given
+        histogram = Histogram(lowest=1, buckets=10)
+
+        # When
+        for value in [1, 2, 3, 4, 100, 5000]:
+            histogram.add(value)
+
+        # Then
+        self.assertEqual((histogram.count, histogram.min, histogram.max), (6, 1, 5000))
+        self.assertEqual(histogram.percentile(50), 4)
+        self.assertEqual(histogram.percentile(80), 128)
+        self.assertEqual(histogram.percentile(100), 5000)
+
+
+class TestStatsObserver(unittest.TestCase):
+
+    def test_report(self):
+        # Given
+        stats = StatsObserver()
+
+        # When
+        stats.request_finished('POST', '/db/data/transaction', 201,
+                               {'encode': 0.001, 'wait': 0.002, 'read': 0.003, 'total': 0.006}, 100, 2000)
+        stats.rows_fetched(None, 10, 0.0005)
+        stats.transaction('begin')
+
+        # Then
+        self.assertEqual((stats.requests, stats.bytes_sent, stats.bytes_received, stats.rows), (1, 100, 2000, 10))
+        report = stats.report()
+        self.assertTrue('transactions: begin 1' in report)
+        self.assertTrue('wait   n=1' in report)
+
+
+if __name__ == '__main__':
+    unittest.main()
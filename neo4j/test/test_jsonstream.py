@@ -0,0 +1,119 @@
+import io
+import json
+import unittest
+
+from neo4j import jsoncodec
+from neo4j.jsonstream import TransactionResponse
+
+
+DOCUMENT = {
+    'commit': 'http://localhost:7474/db/data/transaction/7/commit',
+    'results': [
+        {'columns': ['a'], 'data': [{'rest': [1]}, {'rest': [2]}]},
+        {'columns': ['name', 'n'], 'data': [{'rest': [u'åsa', 12345]}, {'rest': [u'böb', [1.5, None, True]]}]},
+    ],
+    'transaction': {'expires': 'Tue, 11 Mar 2014 19:33:41 +0000'},
+    'errors': [],
+}
+
+
+def response(doc, chunk_size=3):
+    return TransactionResponse(io.BytesIO(json.dumps(doc).encode('utf-8')), chunk_size=chunk_size)
+
+
+class TestTransactionResponse(unittest.TestCase):
+
+    def test_read_all(self):
+        # Given
+        for chunk_size in (1, 2, 3, 7, 8192):
+            # When
+            doc = response(DOCUMENT, chunk_size).read_all()
+
+            # Then
+            self.assertEqual(doc, DOCUMENT)
+
+    def test_read_all_with_codec(self):
+        # Given
+        completed = []
+        resp = TransactionResponse(io.BytesIO(json.dumps(DOCUMENT).encode('utf-8')), on_complete=completed.append,
+                                   codec=jsoncodec.get())
+
+        # When
+        doc = resp.read_all()
+
+        # Then
+        self.assertEqual(doc, DOCUMENT)
+        self.assertEqual(resp.fields['transaction'], DOCUMENT['transaction'])
+        self.assertEqual(completed, [resp])
+        self.assertEqual(list(resp), [])
+
+    def test_streams_rows(self):
+        # Given
+        resp = response(DOCUMENT)
+
+        # When
+        results = iter(resp)
+        first = next(results)
+
+        # Then
+        self.assertEqual(first.columns, ['a'])
+        self.assertEqual(next(first), {'rest': [1]})
+        self.assertFalse(resp.complete)
+
+        # And when skipping the rest of the first result
+        second = next(results)
+
+        # Then
+        self.assertEqual(second.columns, ['name', 'n'])
+        self.assertEqual(list(second), DOCUMENT['results'][1]['data'])
+        self.assertEqual(list(results), [])
+        self.assertTrue(resp.complete)
+        self.assertEqual(resp.errors, [])
+
+    def test_on_complete(self):
+        # Given
+        seen = []
+        doc = {'results': [], 'errors': [{'code': 'Neo.ClientError.Statement.InvalidSyntax', 'message': 'Nope'}]}
+        resp = TransactionResponse(io.BytesIO(json.dumps(doc).encode('utf-8')), on_complete=seen.append)
+
+        # When
+        resp.finish()
+
+        # Then
+        self.assertEqual(seen, [resp])
+        self.assertEqual(resp.errors, doc['errors'])
+
+    def test_truncated(self):
+        # Given
+        raw = json.dumps(DOCUMENT).encode('utf-8')[:-5]
+
+        # When
+        try:
+            TransactionResponse(io.BytesIO(raw), chunk_size=4).read_all()
+            raise Exception("Should not have reached here.")
+        except ValueError:
+            # Then
+            pass
+
+
+class TestCodecs(unittest.TestCase):
+
+    def test_round_trip(self):
+        for name in jsoncodec.CODECS:
+            try:
+                codec = jsoncodec.get(name)
+            except ImportError:
+                continue
+
+            # When
+            data = codec.dumps({'statements': [{'parameters': {0: u'åsa', 'big': 2 ** 70 + 1, 'x': [1.5, None]}}]})
+
+            # Then
+            self.assertTrue(isinstance(data, bytes))
+            self.assertEqual(json.loads(data.decode('utf-8')),
+                             {'statements': [{'parameters': {'0': u'åsa', 'big': 2 ** 70 + 1, 'x': [1.5, None]}}]})
+            self.assertEqual(codec.loads(b'{"rest": [1, "\\u00e5sa", null]}'), {'rest': [1, u'åsa', None]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import neo4j
+from neo4j.parallel import ParallelExecutor
+
+
+class TestParallelExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = neo4j.connect("http://localhost:7474")
+        self.conn.authorization('neo4j', 'testing')
+        self.executor = ParallelExecutor(self.conn, size=4)
+
+    def tearDown(self):
+        self.executor.close()
+
+    def test_execute(self):
+        # When
+        pending = [self.executor.execute("RETURN {0}", i) for i in range(20)]
+
+        # Then
+        self.assertEqual([p.result() for p in pending], [[(i,)] for i in range(20)])
+
+    def test_submit_commits(self):
+        # Given
+        def create(cursor, name):
+            cursor.execute("CREATE (n:TestParallel {name:{0}})", name)
+
+        # When
+        self.executor.submit(create, 'Bob').result()
+
+        # Then other connections should see it
+        cursor = neo4j.connect("http://localhost:7474").cursor()
+        cursor.execute("MATCH (n:TestParallel) RETURN n.name")
+        self.assertEqual(cursor.fetchone(), ('Bob',))
+
+    def test_errors(self):
+        # When
+        pending = self.executor.execute("this is not valid syntax")
+
+        # Then
+        self.assertTrue(isinstance(pending.exception(), neo4j.ProgrammingError))
+
+
+if __name__ == '__main__':
+    unittest.main()
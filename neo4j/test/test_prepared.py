@@ -0,0 +1,66 @@
+import unittest
+
+import neo4j
+from neo4j.prepared import StatementCache
+
+
+class TestStatementCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        # Given
+        cache = StatementCache()
+
+        # When
+        first, first_created = cache.prepare("MATCH (n) RETURN n")
+        second, second_created = cache.prepare("MATCH  (n)\n RETURN n")
+
+        # Then
+        self.assertTrue(first is second)
+        self.assertEqual((first_created, second_created), (True, False))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_prepared(self):
+        # Given
+        cache = StatementCache(max_size=2)
+        cache.prepare("RETURN {a}")
+        cache.prepare("RETURN {b}")
+
+        # When
+        cache.prepare("RETURN {a}")
+        cache.prepare("RETURN {c}")
+
+        # Then
+        self.assertEqual(sorted(p.statement for p in cache), ["RETURN {a}", "RETURN {c}"])
+
+
+class TestPrepare(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = neo4j.connect("http://localhost:7474")
+
+    def test_tracks_executions(self):
+        # Given
+        prepared = self.conn.prepare("MATCH (n) WHERE n.name = {name} RETURN n")
+        cursor = self.conn.cursor()
+
+        # When
+        cursor.execute(prepared, name='Bob')
+        cursor.execute(prepared, name='Alice')
+
+        # Then
+        self.assertEqual(prepared.parameters, frozenset(['name']))
+        self.assertEqual(prepared.executions, 2)
+        self.assertEqual(prepared.signatures, {(('name', 'str'),): 2})
+        self.assertEqual(self.conn.statements.hot(1), [prepared])
+
+    def test_warns_about_literals(self):
+        # When
+        self.conn.prepare("MATCH (n) WHERE n.name = 'Bob' RETURN n")
+
+        # Then
+        self.assertEqual(len(self.conn.messages), 1)
+        self.assertEqual(self.conn.messages[0][0], neo4j.Warning)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -64,6 +64,30 @@ class TestTypes(unittest.TestCase):
         self.assertEqual(node['name'], "Bob")
         self.assertTrue( isinstance(node.id, unicode_type) )
 
+    def test_node_reads_like_a_dict(self):
+        # Given
+        properties = {'name': 'Bob', 'age': 42}
+
+        # When
+        node = neo4j.Node('1', ['User'], properties)
+
+        # Then
+        self.assertEqual(node['name'], 'Bob')
+        self.assertEqual(node.get('missing', 0), 0)
+        self.assertEqual(sorted(node.keys()), ['age', 'name'])
+        self.assertEqual(dict(node), properties)
+        self.assertEqual(node, properties)
+        self.assertTrue('age' in node)
+        self.assertEqual(len(node), 2)
+        self.assertFalse(hasattr(node, '__dict__'))
+
+    def test_interned_names(self):
+        # When
+        first = neo4j.Relationship('1', ''.join(['KNO', 'WS']), '1', '2', {})
+        second = neo4j.Relationship('2', ''.join(['KNOW', 'S']), '2', '3', {})
+
+        # Then
+        self.assertTrue(first.type is second.type)
 
 
 if __name__ == '__main__':